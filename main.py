@@ -11,32 +11,87 @@ It handles the execution flow, scheduling, and user interaction.
 import os
 import sys
 import time
+import queue
+import atexit
+import signal
+import functools
 import logging
+import logging.handlers
+import threading
 import argparse
-import yaml
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Set
 
-# Import modules
-from modules.transcript_fetcher import TranscriptFetcher
-from modules.price_fetcher import PriceFetcher
-from modules.analysis_engine import AnalysisEngine
-from modules.order_manager import OrderManager
+# The sub-modules and PyYAML are imported on first use so that --help and
+# other light commands don't pay for their dependencies
+if TYPE_CHECKING:
+    from modules.transcript_fetcher import TranscriptFetcher
+    from modules.price_fetcher import PriceFetcher
+    from modules.analysis_engine import AnalysisEngine
+    from modules.order_manager import OrderManager
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("ai_portfolio_manager.log"),
-        logging.StreamHandler(sys.stdout)
-    ]
+from modules.utility.cache_utility import create_cache
+from modules.utility.config_utility import index_assets, load_yaml
+
+# Configure logging. Records are handed to a queue and written to the log
+# file and stdout by a background listener thread, so logging calls never
+# block on I/O.
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_file_handler = logging.FileHandler("ai_portfolio_manager.log")
+_file_handler.setFormatter(_log_formatter)
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(_log_formatter)
+
+_log_queue = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, _file_handler, _stream_handler, respect_handler_level=True
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Route every record through the queue. Any handlers already installed are
+# replaced, and the basicConfig calls in sub-modules imported later become
+# no-ops because the root logger already has a handler.
+_root_logger = logging.getLogger()
+for _handler in _root_logger.handlers[:]:
+    _root_logger.removeHandler(_handler)
+_root_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_root_logger.setLevel(logging.INFO)
+
 logger = logging.getLogger('ai_portfolio_manager')
 
 class AIPortfolioManager:
     """Main class that coordinates all portfolio management activities."""
     
+    # (attribute name, path relative to base_path)
+    _PATHS = (
+        ('config_dir', 'config'),
+        ('data_dir', 'data'),
+        # Config file paths
+        ('settings_path', os.path.join('config', 'settings.yaml')),
+        ('assets_path', os.path.join('config', 'assets.yaml')),
+        ('narratives_path', os.path.join('config', 'narratives.yaml')),
+        # Data directories
+        ('transcripts_dir', os.path.join('data', 'transcripts')),
+        ('prices_dir', os.path.join('data', 'prices')),
+        ('analysis_dir', os.path.join('data', 'analysis')),
+        ('orders_dir', os.path.join('data', 'orders')),
+    )
+    
+    # Directories that must exist before the sub-modules are used
+    _REQUIRED_DIRS = ('config_dir', 'transcripts_dir', 'prices_dir', 'analysis_dir', 'orders_dir')
+    
+    # Directories already created in this process, shared by all instances
+    _DIRS_CREATED: Set[str] = set()
+    
+    # Cache key for the latest prices of all crypto assets
+    _PRICES_CACHE_KEY = 'latest_prices'
+    
+    # Lazily created sub-modules that load assets.yaml when constructed, so
+    # they are dropped and rebuilt when it changes
+    _ASSET_DEPENDENT_MODULES = ('price_fetcher', 'analysis_engine', 'order_manager')
+    
     def __init__(self, base_path: str = None, test_mode: bool = False):
         """
         Initialize the AI Portfolio Manager.
@@ -55,46 +110,67 @@ class AIPortfolioManager:
         else:
             self.base_path = base_path
             
-        # Define paths
-        self.config_dir = os.path.join(self.base_path, "config")
-        self.data_dir = os.path.join(self.base_path, "data")
-        
-        # Config file paths
-        self.settings_path = os.path.join(self.config_dir, "settings.yaml")
-        self.assets_path = os.path.join(self.config_dir, "assets.yaml")
-        self.narratives_path = os.path.join(self.config_dir, "narratives.yaml")
-        
-        # Data directories
-        self.transcripts_dir = os.path.join(self.data_dir, "transcripts")
-        self.prices_dir = os.path.join(self.data_dir, "prices")
-        self.analysis_dir = os.path.join(self.data_dir, "analysis")
-        self.orders_dir = os.path.join(self.data_dir, "orders")
+        # Define config file paths and data directories
+        for attr_name, relative_path in self._PATHS:
+            setattr(self, attr_name, os.path.join(self.base_path, relative_path))
         
         # Create directories if they don't exist
-        for directory in [self.config_dir, self.transcripts_dir, self.prices_dir, 
-                          self.analysis_dir, self.orders_dir]:
-            os.makedirs(directory, exist_ok=True)
-        
-        # Load settings
+        for attr_name in self._REQUIRED_DIRS:
+            directory = getattr(self, attr_name)
+            if directory not in AIPortfolioManager._DIRS_CREATED:
+                os.makedirs(directory, exist_ok=True)
+                AIPortfolioManager._DIRS_CREATED.add(directory)
+        
+        # Only stat the config directory when the diagnostics are logged
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Config path: {self.settings_path}")
+            logger.debug(f"Config directory exists: {os.path.isdir(self.config_dir)}")
+        
+        # Load settings and assets; the sub-modules and the asset index then
+        # get them from the shared config cache instead of parsing them again
         self.settings = self._load_yaml(self.settings_path)
+        self._assets = self._load_yaml(self.assets_path)
         
-        # Initialize modules
-        self.transcript_fetcher = TranscriptFetcher(
+        # Latest prices and analyses are cached until the next data refresh
+        self.cache = create_cache(self.settings)
+        self.cache_ttl = self.settings.get('system', {}).get('data_refresh_interval', 3600)
+        
+        # Parsed assets config and derived symbol -> asset info index, both
+        # rebuilt when assets.yaml changes
+        self._asset_index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._asset_index_mtime: Optional[int] = None
+        self._crypto_symbols: List[str] = []
+        
+        # Set to end run_scheduler from a signal handler or another thread
+        self._stop = threading.Event()
+    
+    # Sub-modules are constructed lazily on first access so single-shot
+    # CLI commands only pay for the components they use
+    @functools.cached_property
+    def transcript_fetcher(self) -> 'TranscriptFetcher':
+        """YouTube transcript fetcher, created on first use."""
+        from modules.transcript_fetcher import TranscriptFetcher
+        return TranscriptFetcher(
             config_path=self.settings_path,
             storage_path=self.transcripts_dir
         )
-        
-        print(f"Config path: {self.settings_path}")
-        print(f"Config directory exists: {os.path.exists(os.path.dirname(self.settings_path))}")
-        
-        self.price_fetcher = PriceFetcher(
+    
+    @functools.cached_property
+    def price_fetcher(self) -> 'PriceFetcher':
+        """Price fetcher, created on first use."""
+        from modules.price_fetcher import PriceFetcher
+        return PriceFetcher(
             config_path=self.settings_path,
             assets_path=self.assets_path,
             storage_path=self.prices_dir,
-            test_mode=test_mode
+            test_mode=self.test_mode
         )
-        
-        self.analysis_engine = AnalysisEngine(
+    
+    @functools.cached_property
+    def analysis_engine(self) -> 'AnalysisEngine':
+        """Analysis engine, created on first use."""
+        from modules.analysis_engine import AnalysisEngine
+        return AnalysisEngine(
             config_path=self.settings_path,
             assets_path=self.assets_path,
             narratives_path=self.narratives_path,
@@ -102,19 +178,28 @@ class AIPortfolioManager:
             prices_path=self.prices_dir,
             output_path=self.analysis_dir
         )
-        
-        self.order_manager = OrderManager(
+    
+    @functools.cached_property
+    def order_manager(self) -> 'OrderManager':
+        """Order manager, created on first use."""
+        from modules.order_manager import OrderManager
+        return OrderManager(
             config_path=self.settings_path,
             assets_path=self.assets_path,
             output_path=self.orders_dir,
-            test_mode=test_mode  # Pass the test_mode parameter
+            test_mode=self.test_mode
         )
     
     def _load_yaml(self, file_path: str) -> Dict[str, Any]:
-        """Load YAML configuration file."""
+        """
+        Load YAML configuration file.
+        
+        Files are read through the process-wide config cache (see
+        modules.utility.config_utility.load_yaml), so the returned dict is
+        shared with other components and must not be mutated.
+        """
         try:
-            with open(file_path, 'r') as file:
-                return yaml.safe_load(file)
+            return load_yaml(file_path)
         except Exception as e:
             logger.error(f"Failed to load {file_path}: {e}")
             return {}
@@ -123,26 +208,42 @@ class AIPortfolioManager:
         """Fetch all required data from sources."""
         logger.info("Starting data collection")
         
-        # Fetch YouTube transcripts
-        try:
-            logger.info("Fetching YouTube transcripts")
-            num_transcripts = self.transcript_fetcher.fetch_recent_transcripts()
-            logger.info(f"Fetched {num_transcripts} transcripts")
-        except Exception as e:
-            logger.error(f"Error fetching transcripts: {e}")
-        
-        # Fetch crypto prices
-        try:
-            logger.info("Fetching current crypto prices")
-            current_prices = self.price_fetcher.fetch_crypto_prices()
-            logger.info(f"Fetched current prices for {len(current_prices)} cryptocurrencies")
+        # Transcripts, current prices and historical prices come from
+        # independent sources, so they are fetched concurrently
+        futures = {}
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            try:
+                logger.info("Fetching YouTube transcripts")
+                futures['transcripts'] = executor.submit(self.transcript_fetcher.fetch_recent_transcripts)
+            except Exception as e:
+                logger.error(f"Error fetching transcripts: {e}")
             
-            logger.info("Fetching historical crypto prices")
-            historical_prices = self.price_fetcher.fetch_crypto_historical(days=30)
-            logger.info(f"Fetched historical prices for {len(historical_prices)} cryptocurrencies")
-        except Exception as e:
-            logger.error(f"Error fetching prices: {e}")
+            try:
+                price_fetcher = self.price_fetcher
+                logger.info("Fetching current crypto prices")
+                futures['current'] = executor.submit(price_fetcher.fetch_crypto_prices)
+                logger.info("Fetching historical crypto prices")
+                futures['historical'] = executor.submit(price_fetcher.fetch_crypto_historical, days=30)
+            except Exception as e:
+                logger.error(f"Error fetching prices: {e}")
+        
+        if 'transcripts' in futures:
+            error = futures['transcripts'].exception()
+            if error:
+                logger.error(f"Error fetching transcripts: {error}")
+            else:
+                logger.info(f"Fetched {futures['transcripts'].result()} transcripts")
+        
+        for kind in ('current', 'historical'):
+            if kind not in futures:
+                continue
+            error = futures[kind].exception()
+            if error:
+                logger.error(f"Error fetching {kind} prices: {error}")
+            else:
+                logger.info(f"Fetched {kind} prices for {len(futures[kind].result())} cryptocurrencies")
         
+        self.cache.delete(self._PRICES_CACHE_KEY)
         logger.info("Data collection completed")
     
     def run_analysis(self, symbol: str = None):
@@ -159,18 +260,59 @@ class AIPortfolioManager:
                 # Analyze specific asset
                 logger.info(f"Analyzing {symbol}")
                 analysis = self.analysis_engine.analyze_asset(symbol)
+                self.cache.delete(self._analyses_cache_key())
                 logger.info(f"Analysis for {symbol} completed with status: {analysis.get('status')}")
                 return analysis
             else:
                 # Analyze all crypto assets
                 logger.info("Analyzing all crypto assets")
                 results = self.analysis_engine.analyze_all_crypto()
+                self.cache.delete(self._analyses_cache_key())
                 logger.info(f"Analysis completed for {len(results)} assets")
                 return results
         except Exception as e:
             logger.error(f"Error running analysis: {e}")
             return None
     
+    def _analyses_cache_key(self) -> str:
+        """Cache key for the latest analyses of the currently configured crypto assets."""
+        return 'latest_analyses:' + ','.join(self.crypto_symbols)
+    
+    def _get_latest_analyses(self) -> Dict[str, Any]:
+        """
+        Get the latest stored analysis for each crypto asset.
+        
+        Results are cached until new analyses are run or the cache expires.
+        
+        Returns:
+            Dictionary of symbol -> latest analysis, for symbols that have one
+        """
+        symbols = self.crypto_symbols
+        if not symbols:
+            return {}
+        
+        cache_key = self._analyses_cache_key()
+        analyses = self.cache.get_json(cache_key)
+        if analyses is None:
+            analyses = self.analysis_engine.get_latest_recommendations(symbols)
+            self.cache.set_json(cache_key, analyses, self.cache_ttl)
+        return analyses
+    
+    def _get_latest_prices(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the latest prices for all crypto assets.
+        
+        Results are cached until the next data fetch or the cache expires.
+        
+        Returns:
+            Dictionary of symbol -> price data
+        """
+        prices = self.cache.get_json(self._PRICES_CACHE_KEY)
+        if prices is None:
+            prices = self.price_fetcher.get_latest_prices()
+            self.cache.set_json(self._PRICES_CACHE_KEY, prices, self.cache_ttl)
+        return prices
+    
     def generate_orders(self, analysis_results: Dict[str, Any] = None):
         """
         Generate orders based on analysis results.
@@ -185,26 +327,13 @@ class AIPortfolioManager:
         try:
             # If no analysis provided, get latest for each crypto asset
             if not analysis_results:
-                analysis_results = {}
-                assets = self._load_yaml(self.assets_path)
-                
-                for asset in assets.get('crypto', []):
-                    symbol = asset.get('symbol')
-                    if symbol:
-                        latest = self.analysis_engine.get_latest_recommendation(symbol)
-                        if latest:
-                            analysis_results[symbol] = latest
+                analysis_results = self._get_latest_analyses()
             
-            # Process each analysis to generate orders
-            for symbol, analysis in analysis_results.items():
-                # Extract trading signal
-                signal = self.analysis_engine.extract_trade_signals(analysis)
-                
-                # Create order from signal
-                order = self.order_manager.create_order_from_signal(signal)
-                if order:
-                    orders.append(order)
-                    logger.info(f"Generated {order['side']} order for {symbol}")
+            # Extract trading signals and create orders in one batch each
+            signals = self.analysis_engine.extract_trade_signals_batch(list(analysis_results.values()))
+            orders = self.order_manager.create_orders_from_signals(signals)
+            for order in orders:
+                logger.info("Generated %s order for %s", order['side'], order['symbol'])
             
             logger.info(f"Generated {len(orders)} orders")
             return orders
@@ -223,23 +352,25 @@ class AIPortfolioManager:
         logger.info(f"Executing {len(orders)} orders")
         
         results = []
+        success_count = 0
         
         for order in orders:
             try:
-                logger.info(f"Submitting order: {order['side']} {order['amount']} {order['symbol']}")
+                logger.info("Submitting order: %s %s %s", order['side'], order['amount'], order['symbol'])
                 result = self.order_manager.submit_order(order, confirm=confirm)
                 results.append(result)
                 
                 if result['status'] == 'success':
-                    logger.info(f"Order executed successfully: {result.get('order_id')}")
+                    success_count += 1
+                    logger.info("Order executed successfully: %s", result.get('order_id'))
                 elif result['status'] == 'pending_confirmation':
-                    logger.info(f"Order pending confirmation")
+                    logger.info("Order pending confirmation")
                 else:
-                    logger.warning(f"Order execution failed: {result.get('reason')}")
+                    logger.warning("Order execution failed: %s", result.get('reason'))
             except Exception as e:
-                logger.error(f"Error executing order: {e}")
+                logger.error("Error executing order: %s", e)
         
-        logger.info(f"Order execution completed: {len([r for r in results if r.get('status') == 'success'])}/{len(orders)} successful")
+        logger.info("Order execution completed: %d/%d successful", success_count, len(orders))
         return results
     
     def run_full_cycle(self, symbol: str = None, execute: bool = False, confirm: bool = None):
@@ -292,19 +423,53 @@ class AIPortfolioManager:
         
         logger.info(f"Starting scheduler with {interval_hours} hour interval")
         
+        self._stop.clear()
+        
+        def _request_stop(signum, frame):
+            logger.info(f"Received signal {signum}, stopping scheduler")
+            self.stop()
+        
+        # Signal handlers can only be installed from the main thread
+        previous_handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                previous_handlers[signum] = signal.signal(signum, _request_stop)
+        
         try:
-            while True:
-                logger.info(f"Running scheduled cycle at {datetime.now().isoformat()}")
+            # Cycles are aligned to a monotonic deadline so the cycle duration
+            # does not accumulate into the interval
+            next_deadline = time.monotonic()
+            while not self._stop.is_set():
+                next_deadline += interval_seconds
+                logger.info("Running scheduled cycle")
+                
+                if self.reload_assets():
+                    logger.info("Assets config changed, using updated asset list")
                 
                 try:
                     self.run_full_cycle(execute=False)
                 except Exception as e:
                     logger.error(f"Error in scheduled cycle: {e}")
                 
-                logger.info(f"Next cycle scheduled for {datetime.now() + timedelta(seconds=interval_seconds)}")
-                time.sleep(interval_seconds)
+                # After a cycle overran, start the schedule again from now
+                # rather than running the missed cycles back to back
+                now = time.monotonic()
+                next_deadline = max(next_deadline, now)
+                sleep_for = next_deadline - now
+                logger.info("Next cycle scheduled for %s",
+                            (datetime.now() + timedelta(seconds=sleep_for)).isoformat(timespec='seconds'))
+                self._stop.wait(sleep_for)
+            
+            logger.info("Scheduler stopped")
         except KeyboardInterrupt:
             logger.info("Scheduler stopped by user")
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+    
+    def stop(self):
+        """Stop a running scheduler after its current cycle without waiting out the interval."""
+        self._stop.set()
     
     def print_portfolio_summary(self):
         """Print a summary of the current portfolio status."""
@@ -312,44 +477,42 @@ class AIPortfolioManager:
         
         try:
             # Get latest prices
-            prices = self.price_fetcher.get_latest_prices()
+            prices = self._get_latest_prices()
             
             # Get latest analyses
-            analyses = {}
-            assets = self._load_yaml(self.assets_path)
-            
-            for asset in assets.get('crypto', []):
-                symbol = asset.get('symbol')
-                if symbol:
-                    latest = self.analysis_engine.get_latest_recommendation(symbol)
-                    if latest:
-                        analyses[symbol] = latest
+            analyses = self._get_latest_analyses()
             
             # Get recent orders
             orders = self.order_manager.get_order_history(days_back=7)
             
-            # Print summary
-            print("\n" + "="*80)
-            print(" AI PORTFOLIO MANAGER - SUMMARY ".center(80, "="))
-            print("="*80)
-            
-            print("\nASSET PRICES:")
-            print("-" * 60)
-            for symbol, price_data in prices.items():
-                print(f"{symbol}: ${price_data.get('price', 'N/A')} ({price_data.get('change_24h_percent', 'N/A')}%)")
-            
-            print("\nLATEST RECOMMENDATIONS:")
-            print("-" * 60)
-            for symbol, analysis in analyses.items():
-                signal = self.analysis_engine.extract_trade_signals(analysis)
-                print(f"{symbol}: {signal.get('action')} ({signal.get('sentiment')}, {signal.get('confidence')})")
-            
-            print("\nRECENT ORDERS:")
-            print("-" * 60)
-            for order in orders[:5]:  # Show 5 most recent
-                print(f"{order.get('timestamp', 'N/A')}: {order.get('side', 'N/A').upper()} {order.get('amount', 'N/A')} {order.get('symbol', 'N/A')} @ {order.get('price', 'market')}")
-            
-            print("\n" + "="*80 + "\n")
+            # Build the whole summary and write it in one call
+            signals = self.analysis_engine.extract_trade_signals_batch(list(analyses.values()))
+            lines = [
+                "\n" + "="*80 + "\n",
+                " AI PORTFOLIO MANAGER - SUMMARY ".center(80, "=") + "\n",
+                "="*80 + "\n",
+                "\nASSET PRICES:\n",
+                "-" * 60 + "\n",
+                "".join(
+                    f"{symbol}: ${price_data.get('price', 'N/A')} ({price_data.get('change_24h_percent', 'N/A')}%)\n"
+                    for symbol, price_data in prices.items()
+                ),
+                "\nLATEST RECOMMENDATIONS:\n",
+                "-" * 60 + "\n",
+                "".join(
+                    f"{symbol}: {trade_signal.get('action')} ({trade_signal.get('sentiment')}, {trade_signal.get('confidence')})\n"
+                    for symbol, trade_signal in zip(analyses, signals)
+                ),
+                "\nRECENT ORDERS:\n",
+                "-" * 60 + "\n",
+                "".join(
+                    f"{order.get('timestamp', 'N/A')}: {order.get('side', 'N/A').upper()} {order.get('amount', 'N/A')} {order.get('symbol', 'N/A')} @ {order.get('price', 'market')}\n"
+                    for order in orders[:5]  # Show 5 most recent
+                ),
+                "\n" + "="*80 + "\n\n",
+            ]
+            sys.stdout.write("".join(lines))
+            sys.stdout.flush()
             
         except Exception as e:
             logger.error(f"Error generating summary: {e}")
@@ -389,7 +552,7 @@ class AIPortfolioManager:
             "side": "buy",
             "amount": amount,
             "exchange": exchange,  # Add exchange information
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds')
         }
         
         # Add price for limit orders
@@ -406,11 +569,11 @@ class AIPortfolioManager:
         result = self.order_manager.submit_order(order, confirm=confirm)
         
         if result.get('status') == 'success':
-            logger.info(f"Buy order placed successfully: {result.get('order_id')}")
+            logger.info("Buy order placed successfully: %s", result.get('order_id'))
         elif result.get('status') == 'pending_confirmation':
-            logger.info(f"Buy order pending confirmation")
+            logger.info("Buy order pending confirmation")
         else:
-            logger.error(f"Buy order failed: {result.get('reason')}")
+            logger.error("Buy order failed: %s", result.get('reason'))
         
         return result
 
@@ -424,19 +587,8 @@ class AIPortfolioManager:
         logger.info("Checking account balance")
         
         try:
-            # Create a PriceFetcher instance if we don't have one
-            if not hasattr(self, 'price_fetcher'):
-                from modules.price_fetcher import PriceFetcher
-                price_fetcher = PriceFetcher(
-                    config_path=self.settings_path,
-                    assets_path=self.assets_path,
-                    test_mode=self.test_mode
-                )
-            else:
-                price_fetcher = self.price_fetcher
-            
             # Get the balance from KuCoin
-            balance_info = price_fetcher.get_account_balance()
+            balance_info = self.price_fetcher.get_account_balance()
             
             if not balance_info:
                 logger.error("Failed to retrieve account balance")
@@ -499,7 +651,7 @@ class AIPortfolioManager:
             "side": "sell",
             "amount": amount,
             "exchange": exchange,  # Add exchange information
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds')
         }
         
         # Add price for limit orders
@@ -516,11 +668,11 @@ class AIPortfolioManager:
         result = self.order_manager.submit_order(order, confirm=confirm)
         
         if result.get('status') == 'success':
-            logger.info(f"Sell order placed successfully: {result.get('order_id')}")
+            logger.info("Sell order placed successfully: %s", result.get('order_id'))
         elif result.get('status') == 'pending_confirmation':
-            logger.info(f"Sell order pending confirmation")
+            logger.info("Sell order pending confirmation")
         else:
-            logger.error(f"Sell order failed: {result.get('reason')}")
+            logger.error("Sell order failed: %s", result.get('reason'))
         
         return result
 
@@ -569,21 +721,77 @@ class AIPortfolioManager:
             print(f"Failed to cancel orders: {result.get('reason')}")
         
         return result
-    #helper method to retrieve asset info
+    
+    def _rebuild_asset_index(self) -> Dict[str, Dict[str, Any]]:
+        """Build the symbol -> asset info index and crypto symbol list from the assets config."""
+        assets = self._load_yaml(self.assets_path) or {}
+        self._assets = assets
+        
+        # Symbol -> asset info (with its category as 'type'); the first
+        # category listing a symbol wins, crypto before stocks
+        index = {
+            symbol: {**asset, 'type': asset_category}
+            for symbol, (asset_category, asset) in index_assets(assets).items()
+        }
+        
+        self._crypto_symbols = [asset['symbol'] for asset in assets.get('crypto', []) if asset.get('symbol')]
+        self._asset_index = index
+        return index
+    
+    def _get_asset_index(self) -> Dict[str, Dict[str, Any]]:
+        """Get the symbol -> asset info index, rebuilding it if assets.yaml changed."""
+        try:
+            mtime = os.stat(self.assets_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        
+        if self._asset_index is None or mtime != self._asset_index_mtime:
+            if self._asset_index is not None:
+                self._drop_asset_dependent_modules()
+            self._asset_index_mtime = mtime
+            return self._rebuild_asset_index()
+        return self._asset_index
+    
+    def _drop_asset_dependent_modules(self):
+        """Forget the sub-modules and cached prices built from the previous assets config."""
+        for attr_name in self._ASSET_DEPENDENT_MODULES:
+            # functools.cached_property stores its value in the instance dict
+            self.__dict__.pop(attr_name, None)
+        self.cache.delete(self._PRICES_CACHE_KEY)
+    
+    def reload_assets(self) -> bool:
+        """
+        Re-read assets.yaml if it changed since it was last loaded.
+        
+        The sub-modules that depend on the assets config are rebuilt on their
+        next use, so they pick up the new asset list too.
+        
+        Returns:
+            True if a previously loaded assets config was replaced
+        """
+        previous_mtime = self._asset_index_mtime
+        was_loaded = self._asset_index is not None
+        self._get_asset_index()
+        return was_loaded and self._asset_index_mtime != previous_mtime
+    
+    @property
+    def assets(self) -> Dict[str, Any]:
+        """Parsed assets config shared by all lookups, refreshed when assets.yaml changes."""
+        self._get_asset_index()
+        return self._assets
+    
+    @property
+    def crypto_symbols(self) -> List[str]:
+        """Symbols of the configured crypto assets, refreshed when assets.yaml changes."""
+        self._get_asset_index()
+        return self._crypto_symbols
+    
     def _get_asset_info(self, symbol: str):
         """Get asset information from the assets config."""
-        assets = self._load_yaml(self.assets_path)
-        
-        for asset_category in ['crypto', 'stocks']:
-            for asset in assets.get(asset_category, []):
-                if asset.get('symbol') == symbol:
-                    asset_info = asset.copy()
-                    asset_info['type'] = asset_category
-                    return asset_info
-        return None
+        return self._get_asset_index().get(symbol)
 
-def main():
-    """Main entry point for the application."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser."""
     parser = argparse.ArgumentParser(description='AI Portfolio Manager')
     
     parser.add_argument('--fetch', action='store_true', help='Fetch data only')
@@ -606,7 +814,43 @@ def main():
     parser.add_argument('--cancel-all', action='store_true', help='Cancel all orders')
     parser.add_argument('--balance', action='store_true', help='Check account balance')
     
-    args = parser.parse_args()
+    return parser
+
+# Built once at import and reused by every main() call in this interpreter
+_PARSER = _build_parser()
+
+def _place_order(place: Any, args: argparse.Namespace, confirm: Optional[bool]):
+    """Validate the order arguments and place the order with the given manager method."""
+    if not args.symbol:
+        print("Error: Symbol must be specified with --symbol")
+    elif not args.amount:
+        print("Error: Amount must be specified with --amount")
+    else:
+        place(args.symbol, args.amount, args.price, confirm)
+
+# CLI actions as (flag, handler) in priority order; handlers take the manager,
+# the parsed arguments and the resolved confirmation setting
+_ACTIONS = (
+    ('cancel', lambda manager, args, confirm: manager.cancel_specific_order(args.cancel)),
+    ('cancel_all', lambda manager, args, confirm: manager.cancel_all_orders(args.symbol)),
+    ('fetch', lambda manager, args, confirm: manager.fetch_data()),
+    ('analyze', lambda manager, args, confirm: manager.run_analysis(args.symbol)),
+    ('generate', lambda manager, args, confirm: manager.generate_orders()),
+    ('cycle', lambda manager, args, confirm: manager.run_full_cycle(args.symbol, args.execute, confirm)),
+    ('schedule', lambda manager, args, confirm: manager.run_scheduler(args.interval)),
+    ('sell', lambda manager, args, confirm: _place_order(manager.sell_asset, args, confirm)),
+    ('buy', lambda manager, args, confirm: _place_order(manager.buy_asset, args, confirm)),
+    ('balance', lambda manager, args, confirm: manager.check_account_balance()),
+)
+
+def main(argv: List[str] = None):
+    """
+    Main entry point for the application.
+    
+    Args:
+        argv: Command line arguments (default: sys.argv[1:])
+    """
+    args = _PARSER.parse_args(argv)
     
     # Create the manager with test mode
     manager = AIPortfolioManager(test_mode=args.test)
@@ -618,39 +862,15 @@ def main():
     elif args.auto:
         confirm = False
     
-    # Execute requested action
-    if args.cancel:
-        manager.cancel_specific_order(args.cancel)
-    elif args.cancel_all:
-        manager.cancel_all_orders(args.symbol)  # Will use symbol if specified
-    elif args.fetch:
-        manager.fetch_data()
-    elif args.analyze:
-        manager.run_analysis(args.symbol)
-    elif args.generate:
-        manager.generate_orders()
-    elif args.cycle:
-        manager.run_full_cycle(args.symbol, args.execute, confirm)
-    elif args.schedule:
-        manager.run_scheduler(args.interval)
-    elif args.sell:
-        if not args.symbol:
-            print("Error: Symbol must be specified with --symbol")
-        elif not args.amount:
-            print("Error: Amount must be specified with --amount")
-        else:
-            manager.sell_asset(args.symbol, args.amount, args.price, args.confirm)
-    elif args.buy:
-        if not args.symbol:
-            print("Error: Symbol must be specified with --symbol")
-        elif not args.amount:
-            print("Error: Amount must be specified with --amount")
-        else:
-            manager.buy_asset(args.symbol, args.amount, args.price, args.confirm)
-    elif args.summary or not any([args.fetch, args.analyze, args.generate, 
-                                args.cycle, args.schedule, args.execute, args.buy, args.sell]):
-        # Default action is to print summary
-        manager.print_portfolio_summary()
+    # Run the first requested action, or print the summary if none was given.
+    # --execute only modifies --cycle, so on its own it does nothing.
+    for flag, action in _ACTIONS:
+        if getattr(args, flag):
+            action(manager, args, confirm)
+            break
+    else:
+        if args.summary or not args.execute:
+            manager.print_portfolio_summary()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,13 +6,24 @@ then uses DeepSeek V3 to generate trading decisions through function calling.
 """
 
 import os
+import re
+import mmap
+import copy
 import json
+import math
+import time
+import hashlib
+import textwrap
 import logging
-import yaml
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, FrozenSet, List, Any, Optional, Tuple
 import requests
-from openai import OpenAI
+
+from modules.utility.config_utility import index_assets, load_yaml
+from modules.utility.deepseek_utility import get_deepseek_client
 
 # Configure logging
 logging.basicConfig(
@@ -21,6 +32,510 @@ logging.basicConfig(
 )
 logger = logging.getLogger('analysis_engine')
 
+# Aho-Corasick matches all keywords in one pass over the text; without it a
+# compiled regex alternation is used
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+@functools.lru_cache(maxsize=256)
+def _keyword_matcher(keywords: FrozenSet[str]) -> Callable[[str], bool]:
+    """
+    Build a predicate telling whether a text contains any of the keywords.
+    
+    Args:
+        keywords: Lowercase keywords to look for
+        
+    Returns:
+        Function taking a lowercase text and returning True on any match
+    """
+    if '' in keywords:
+        # The empty string is a substring of every text
+        return lambda text: True
+    if not keywords:
+        return lambda text: False
+    
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    
+    pattern = re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+    return lambda text: pattern.search(text) is not None
+
+@functools.lru_cache(maxsize=64)
+def _symbols_matcher(keywords_by_symbol: Tuple[Tuple[str, FrozenSet[str]], ...]) -> Callable[[str], List[str]]:
+    """
+    Build a function telling which assets a text is relevant to.
+    
+    With Aho-Corasick, one automaton holds the keywords of all assets with
+    the matching symbols as payload, so each text is scanned once no matter
+    how many assets there are. Otherwise each asset's matcher is tried in turn,
+    after a single regex over all keywords has rejected the many texts that
+    mention no asset at all.
+    
+    Args:
+        keywords_by_symbol: Pairs of (symbol, lowercase keywords)
+        
+    Returns:
+        Function taking a lowercase text and returning the matching symbols
+    """
+    if not AHOCORASICK_AVAILABLE:
+        matchers = [(symbol, _keyword_matcher(keywords)) for symbol, keywords in keywords_by_symbol]
+        matches_any = _keyword_matcher(frozenset().union(*(keywords for _, keywords in keywords_by_symbol)))
+        return lambda text: [symbol for symbol, matches in matchers if matches(text)] if matches_any(text) else []
+    
+    symbols_by_keyword: Dict[str, set] = {}
+    for symbol, keywords in keywords_by_symbol:
+        for keyword in keywords:
+            symbols_by_keyword.setdefault(keyword, set()).add(symbol)
+    
+    # The empty string is a substring of every text
+    always = symbols_by_keyword.pop('', set())
+    if not symbols_by_keyword:
+        return lambda text: list(always)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, symbols in symbols_by_keyword.items():
+        automaton.add_word(keyword, frozenset(symbols))
+    automaton.make_automaton()
+    
+    def match(text: str) -> List[str]:
+        found = set(always)
+        for _, symbols in automaton.iter(text):
+            found |= symbols
+        return list(found)
+    
+    return match
+
+# orjson parses and serializes several times faster than the json module and
+# works on bytes directly
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _read_json(file_path: str) -> Any:
+    """
+    Read and parse a JSON file, using orjson when available.
+    
+    With orjson, files of at least a page are memory-mapped and parsed in
+    place rather than copied into a bytes object first.
+    """
+    with open(file_path, 'rb') as file:
+        if ORJSON_AVAILABLE and os.fstat(file.fileno()).st_size >= mmap.PAGESIZE:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return orjson.loads(view)
+        data = file.read()
+    return _loads(data)
+
+def _loads(data: Any) -> Any:
+    """
+    Parse JSON from str or bytes, using orjson when available.
+    
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch
+    the latter either way.
+    """
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+# Comma directly before a closing bracket, which JSON does not allow. String
+# literals are matched too, so commas inside them are left alone.
+_TRAILING_COMMA_RE = re.compile(r'"(?:[^"\\]|\\.)*"|,\s*([}\]])')
+
+def _repair_json(text: str) -> str:
+    """
+    Best-effort fix of a model's almost-JSON object response.
+    
+    Text around the outermost object (e.g. markdown fences) is dropped,
+    trailing commas are removed, and a response cut off mid-way gets its
+    open string and brackets closed.
+    
+    Args:
+        text: Response text that failed to parse
+        
+    Returns:
+        Text that may now parse as JSON
+    """
+    start = text.find('{')
+    if start == -1:
+        return text
+    
+    closers = []
+    in_string = escaped = False
+    end = len(text)
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            closers.append('}' if char == '{' else ']')
+        elif char in '}]' and closers:
+            closers.pop()
+            if not closers:
+                end = i + 1
+                break
+    
+    repaired = text[start:end]
+    if closers:
+        if in_string:
+            repaired += '"'
+        repaired = repaired.rstrip().rstrip(',:') + ''.join(reversed(closers))
+    return _TRAILING_COMMA_RE.sub(lambda match: match.group(1) or match.group(0), repaired)
+
+def _dumps(obj: Any) -> str:
+    """Serialize an object to compact JSON text, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj)
+
+# Recommendation, sentiment and confidence markers looked for in free-text
+# analyses. No token can overlap another, so one scan finds all of them.
+_SIGNAL_TOKEN_RE = re.compile(r'BUY|SELL|HOLD|ACCUMULATE|Bullish|Bearish|Confidence: High|Confidence: Medium')
+
+# Transcript file names ending in the publish date: {video_id}_{YYYYMMDD}.json
+_DATED_TRANSCRIPT_RE = re.compile(r'^.+_(\d{8})\.json$')
+
+# Transcript key holding (text, lowercase text) pairs of its segments, added
+# when a transcript is loaded
+_LOWERED_SEGMENTS_KEY = '_segments_lower'
+
+def _lowered_segments(transcript: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Pair the text of each transcript segment with its lowercase form."""
+    texts = [segment.get('text', '') for segment in transcript.get('transcript', [])]
+    return [(text, text.lower()) for text in texts]
+
+# Below this many files, reading them on a thread pool costs more than it saves
+PARALLEL_READ_MIN_FILES = 4
+
+# Fields of the structured analysis requested from DeepSeek
+_ANALYSIS_FIELDS = """    "sentiment": "bullish|neutral|bearish",
+    "confidence": "high|medium|low",
+    "key_points": ["point1", "point2", "point3", ...],
+    "price_forecast": {
+        "short_term": "text forecast for 1-2 weeks",
+        "medium_term": "text forecast for 1-3 months"
+    },
+    "recommendation": "buy|sell|hold",
+    "risk_factors": ["risk1", "risk2", "risk3", ...],
+    "trading_strategy": "detailed trading strategy text",
+    "entry_points": [price1, price2, ...],
+    "exit_points": [price1, price2, ...],
+    "analysis_text": "full text analysis with all details\""""
+
+_ALLOCATION_GUIDELINES = """For buy/sell decisions, determine an appropriate portfolio allocation percentage based on confidence level:
+- High confidence: Consider larger allocations (10-15% of portfolio)
+- Medium confidence: Consider moderate allocations (5-8% of portfolio)
+- Low confidence: Consider smaller allocations (1-3% of portfolio) or holding"""
+
+_ANALYST_SYSTEM_PROMPT = f"""You are a professional financial analyst specialized in cryptocurrency and stock markets.
+Analyze the provided data and output a structured analysis in this exact JSON format:
+{{
+{_ANALYSIS_FIELDS}
+}}"""
+
+_EXECUTOR_SYSTEM_PROMPT = f"""You are a trading executor that converts financial analysis into concrete trading actions.
+Based on the analysis provided, determine whether to buy, sell, or hold the asset.
+{_ALLOCATION_GUIDELINES}
+
+Always provide a clear rationale for your decision. Keep allocation percentages within prudent risk management guidelines."""
+
+# Function the V3 model calls with its trading decision
+_PLACE_ORDER_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "place_market_order",
+        "description": "Execute a market order for asset trading",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "symbol": {"type": "string", "description": "The asset symbol (e.g., BTC, ETH)"},
+                "action": {"type": "string", "enum": ["buy", "sell", "hold"], "description": "Trading action to take"},
+                "allocation_percentage": {"type": "number", "description": "Percentage of portfolio AUM to allocate (1-15%)"},
+                "confidence": {"type": "string", "enum": ["high", "medium", "low"], "description": "Confidence level in the decision"},
+                "reason": {"type": "string", "description": "Rationale for the trading decision"}
+            },
+            "required": ["symbol", "action", "confidence", "reason"]
+        }
+    }
+}
+
+_TRADING_DECISION_FIELD = """    "trading_decision": {
+        "symbol": "asset symbol",
+        "action": "buy|sell|hold",
+        "allocation_percentage": number,
+        "confidence": "high|medium|low",
+        "reason": "rationale for the trading decision"
+    }"""
+
+# Analysis and trading decision in one response, see _analyze_and_decide
+_COMBINED_SYSTEM_PROMPT = f"""You are a professional financial analyst specialized in cryptocurrency and stock markets.
+Analyze the provided data, then decide whether to buy, sell, or hold the asset.
+{_ALLOCATION_GUIDELINES}
+
+Output a single JSON object in this exact format:
+{{
+{_ANALYSIS_FIELDS},
+{_TRADING_DECISION_FIELD}
+}}"""
+
+# Analyses and trading decisions for several assets in one response, see
+# _analyze_group
+_GROUP_SYSTEM_PROMPT = f"""You are a professional financial analyst specialized in cryptocurrency and stock markets.
+Analyze the provided data for each asset separately, then decide whether to buy, sell, or hold it.
+{_ALLOCATION_GUIDELINES}
+
+Output a single JSON object with one entry per asset in this exact format:
+{{
+    "analyses": [
+        {{
+            "symbol": "asset symbol",
+{textwrap.indent(_ANALYSIS_FIELDS, ' ' * 8)},
+{textwrap.indent(_TRADING_DECISION_FIELD, ' ' * 8)}
+        }},
+        ...
+    ]
+}}"""
+
+# Static parts of the single asset prompt built in _analyze_asset
+_ASSET_PROMPT_HEADER = """
+You are a professional financial analyst specialized in {asset_type} markets.
+
+Today's date: {date}
+
+"""
+
+_ASSET_PROMPT_FOOTER = """
+
+Based on the information above, provide a structured analysis of {symbol} with the following required components:
+1. Overall sentiment (Bullish, Neutral, or Bearish) and confidence level (High, Medium, Low)
+2. Key points from the influencer content
+3. Price forecast for short-term (1-2 weeks) and medium-term (1-3 months)
+4. Clear recommendation (BUY, SELL, or HOLD)
+5. Risk factors to consider
+6. Specific trading strategy with entry/exit points if applicable
+
+Your analysis must be objective and focus only on the information provided.
+"""
+
+def _dump_json(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize an object to UTF-8 JSON, indented if pretty, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+# Canned analyses returned by _dummy_query_deepseek_r1, built once rather
+# than on every fallback
+_DUMMY_BTC_ANALYSIS = {
+    "sentiment": "bullish",
+    "confidence": "high",
+    "key_points": [
+        "Strong institutional adoption trend continuing in 2025",
+        "Technical analysis shows support at current levels with resistance at $70,000",
+        "Market narratives around Bitcoin as an inflation hedge remain strong",
+        "Recent regulatory clarity has been generally positive for Bitcoin"
+    ],
+    "price_forecast": {
+        "short_term": "Likely to test $70,000 resistance level",
+        "medium_term": "Potential for new all-time highs if current support holds"
+    },
+    "recommendation": "buy",
+    "risk_factors": [
+        "Potential regulatory changes in major markets",
+        "Macroeconomic factors affecting risk assets broadly",
+        "Technical resistance at $70,000 could lead to short-term rejection"
+    ],
+    "trading_strategy": "Accumulate at current prices. Set buy orders at support levels around $64,000-$65,000. Take partial profits at $70,000 and $75,000 levels.",
+    "entry_points": [64000, 65000],
+    "exit_points": [70000, 75000],
+    "analysis_text": """
+Analysis for Bitcoin (BTC):
+
+Sentiment: Bullish
+Confidence: High
+
+Key Points:
+1. Multiple influencers have highlighted the strong institutional adoption trend continuing in 2025.
+2. Technical analysis shows support at current levels with resistance at $70,000.
+3. Market narratives around Bitcoin as an inflation hedge remain strong.
+4. Recent regulatory clarity has been generally positive for Bitcoin.
+
+Price Forecast:
+- Short-term (1-2 weeks): Likely to test $70,000 resistance level
+- Medium-term (1-3 months): Potential for new all-time highs if current support holds
+
+Recommendation:
+ACCUMULATE at current prices. Consider setting buy orders at support levels around $64,000-$65,000. 
+Set take-profit orders at $70,000 and $75,000 levels.
+
+Risk Factors:
+- Potential regulatory changes in major markets
+- Macroeconomic factors affecting risk assets broadly
+- Technical resistance at $70,000 could lead to short-term rejection
+
+Trading Strategy:
+- Maintain current position
+- Consider adding 5-10% to position at support levels
+- Take partial profits at resistance levels
+"""
+}
+
+_DUMMY_ETH_ANALYSIS = {
+    "sentiment": "neutral",
+    "confidence": "medium",
+    "key_points": [
+        "The recent Ethereum upgrade has positive long-term implications",
+        "DeFi activity on Ethereum has been increasing steadily",
+        "Competition from alternative L1s remains a concern for market share",
+        "Technical analysis shows a consolidation pattern forming"
+    ],
+    "price_forecast": {
+        "short_term": "Likely to remain in the $3300-$3600 range",
+        "medium_term": "Potential upside to $4000+ if broader crypto market remains strong"
+    },
+    "recommendation": "hold",
+    "risk_factors": [
+        "Technical issues with recent upgrade could impact sentiment",
+        "Continued gas fee concerns affecting user experience",
+        "Competition from alternative L1 blockchains"
+    ],
+    "trading_strategy": "Hold current position. Consider adding on dips below $3200. Set buy orders at $3200 and $3000 levels.",
+    "entry_points": [3000, 3200],
+    "exit_points": [4000, 4200],
+    "analysis_text": """
+Analysis for Ethereum (ETH):
+
+Sentiment: Neutral to Bullish
+Confidence: Medium
+
+Key Points:
+1. The recent Ethereum upgrade has positive long-term implications but short-term impact is uncertain.
+2. DeFi activity on Ethereum has been increasing steadily.
+3. Competition from alternative L1s remains a concern for market share.
+4. Technical analysis shows a consolidation pattern forming.
+
+Price Forecast:
+- Short-term (1-2 weeks): Likely to remain in the $3300-$3600 range
+- Medium-term (1-3 months): Potential upside to $4000+ if broader crypto market remains strong
+
+Recommendation:
+HOLD current position. Consider adding on dips below $3200.
+
+Risk Factors:
+- Technical issues with recent upgrade could impact sentiment
+- Continued gas fee concerns affecting user experience
+- Competition from alternative L1 blockchains
+
+Trading Strategy:
+- Maintain current position
+- Set buy orders at support levels ($3200, $3000)
+- Consider rebalancing if ETH/BTC ratio falls further
+"""
+}
+
+_DEFAULT_DUMMY_ANALYSIS = {
+    "sentiment": "neutral",
+    "confidence": "low",
+    "key_points": [
+        "Insufficient data to make a strong recommendation",
+        "Market conditions remain uncertain",
+        "Technical indicators are mixed"
+    ],
+    "price_forecast": {
+        "short_term": "Uncertain short-term outlook",
+        "medium_term": "Direction will depend on broader market conditions"
+    },
+    "recommendation": "hold",
+    "risk_factors": [
+        "High market volatility",
+        "Limited information available",
+        "Uncertain regulatory environment"
+    ],
+    "trading_strategy": "Hold current position until more data becomes available. Monitor market conditions closely.",
+    "entry_points": [],
+    "exit_points": [],
+    "analysis_text": """
+Analysis:
+
+Sentiment: Neutral
+Confidence: Low
+
+Key Points:
+1. Insufficient data to make a strong recommendation.
+2. Market conditions remain uncertain.
+3. Technical indicators are mixed.
+
+Recommendation:
+HOLD current position until more data becomes available.
+
+Risk Factors:
+- High market volatility
+- Limited information available
+
+Trading Strategy:
+- Wait for more clear signals before taking action
+- Monitor market conditions closely
+"""
+}
+
+# Checked in this order; the first symbol found in the prompt wins
+_DUMMY_ANALYSES = {"BTC": _DUMMY_BTC_ANALYSIS, "ETH": _DUMMY_ETH_ANALYSIS}
+
+def _decision_inputs(analysis_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pick the parts of an analysis the V3 model bases its trading decision on.
+    
+    The full analysis (notably analysis_text) would multiply the prompt size
+    without changing the decision.
+    """
+    return {
+        "recommendation": analysis_data.get("recommendation"),
+        "confidence": analysis_data.get("confidence"),
+        "key_points": (analysis_data.get("key_points") or [])[:3],
+        "risk_factors": (analysis_data.get("risk_factors") or [])[:2],
+        "price_forecast": analysis_data.get("price_forecast")
+    }
+
+def _current_date() -> str:
+    """Today's date as YYYY-MM-DD, taken once per call into the engine and passed down."""
+    return datetime.now().strftime("%Y-%m-%d")
+
+def _write_atomic(file_path: str, payload: bytes) -> None:
+    """
+    Write a file through a temporary file renamed into place, so readers
+    never see it partially written.
+    """
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        # Unbuffered fd, so the payload normally goes out in a single write
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 class AnalysisEngine:
     """Analyzes data and generates investment recommendations."""
     
@@ -49,65 +564,127 @@ class AnalysisEngine:
         else:
             self.output_path = output_path
             
+        # Directory -> parsed secrets.yaml in it (None if absent), see _load_secrets
+        self._secrets_by_dir: Dict[str, Optional[Dict[str, Any]]] = {}
+        
         # Load configurations
         self.config = self._load_yaml(config_path)
         self.assets = self._load_yaml(assets_path)
         self.narratives = self._load_yaml(narratives_path)
         
+        # Symbol -> (category, asset info), see _build_asset_index
+        self._asset_index = self._build_asset_index()
+        # Symbol -> comma separated tags, as shown in the prompts
+        self._asset_tags = {symbol: ', '.join(asset.get('tags', []))
+                            for symbol, (_, asset) in self._asset_index.items()}
+        
+        # Symbol -> lowercase keywords of the narratives affecting it
+        self._narrative_keywords = self._build_narrative_keywords()
+        
         # Create output directory if it doesn't exist
         os.makedirs(self.output_path, exist_ok=True)
         
+        # DeepSeek responses keyed by a hash of the request, see _cached_response
+        self._llm_cache_dir = os.path.join(self.output_path, "llm_cache")
+        self.llm_cache_ttl = self.config.get('apis', {}).get('deepseek', {}).get('cache_ttl_s', 3600)
+        if self.llm_cache_ttl > 0:
+            os.makedirs(self._llm_cache_dir, exist_ok=True)
+        
         # Initialize DeepSeek API credentials
         self.deepseek_api_key = self.config.get('apis', {}).get('deepseek', {}).get('api_key', '')
         self.deepseek_r1_model = self.config.get('apis', {}).get('deepseek', {}).get('model', 'deepseek-r1-large')
         self.deepseek_v3_model = self.config.get('apis', {}).get('deepseek', {}).get('function_model', 'deepseek-chat')
+        self.max_concurrent_requests = self.config.get('apis', {}).get('deepseek', {}).get('max_concurrent_requests', 8)
+        self.single_call = self.config.get('apis', {}).get('deepseek', {}).get('single_call', True)
+        
+        # Analyses matching any of these field values get the rule-based
+        # decision instead of a V3 call, see _skips_v3
+        self.skip_v3_when = self.config.get('apis', {}).get('deepseek', {}).get(
+            'skip_v3_when', [{'recommendation': 'hold', 'confidence': 'low'}]
+        ) or []
+        
+        # Upper bound on transcript content included in each analysis prompt
+        self.max_prompt_chars = self.config.get('analysis', {}).get('max_prompt_chars', 16000)
+        
+        # Assets analyzed together in one request by analyze_assets, see _analyze_group
+        self.assets_per_request = min(8, max(1, self.config.get('analysis', {}).get('assets_per_request', 1)))
         
-        # Initialize DeepSeek clients
-        self.analysis_client = None
-        self.execution_client = None
+        # Whether saved analyses are indented for reading by hand
+        self.pretty_json = self.config.get('analysis', {}).get('pretty_json', False)
+        
+        # Bounds the DeepSeek calls in flight across all threads using this engine
+        self._api_slots = threading.BoundedSemaphore(max(1, self.max_concurrent_requests))
+        
+        # Initialize the DeepSeek client, used for both analysis (R1) and
+        # execution (V3) as they share the endpoint and key
+        self.client = None
         
         if self.deepseek_api_key:
             try:
-                # Create client for analysis (R1)
-                self.analysis_client = OpenAI(
-                    api_key=self.deepseek_api_key,
-                    base_url="https://api.deepseek.com"
-                )
-                
-                # Create client for execution (V3)
-                self.execution_client = OpenAI(
-                    api_key=self.deepseek_api_key,
-                    base_url="https://api.deepseek.com"
-                )
-                
-                logger.info("DeepSeek clients initialized successfully")
+                self.client = get_deepseek_client(self.deepseek_api_key, max(1, self.max_concurrent_requests))
+                logger.info("DeepSeek client initialized successfully")
             except Exception as e:
-                logger.error(f"Error initializing DeepSeek clients: {e}")
+                logger.error(f"Error initializing DeepSeek client: {e}")
                 logger.error("Falling back to dummy implementation")
+        
+        # Transcripts loaded by _get_transcripts, with the directory mtime and
+        # day they were loaded for
+        self._transcripts_cache: Optional[Tuple[int, str, List[Dict[str, Any]]]] = None
+        
+        
+        # (symbol, kind) -> (path, mtime, parsed price data), see _read_price_file
+        self._price_files: Dict[Tuple[str, str], Tuple[str, int, Any]] = {}
+        
+        # (directory, kinds) -> (mtime, (symbol, kind) -> newest file path), see _latest_files
+        self._file_indexes: Dict[Tuple[str, Tuple[str, ...]], Tuple[int, Dict[Tuple[str, str], str]]] = {}
     
     def _load_yaml(self, file_path: str) -> Dict[str, Any]:
-        """Load YAML configuration file."""
+        """
+        Load YAML configuration file.
+        
+        Files are read through the process-wide config cache, which keeps a
+        JSON snapshot of each parse. The cached dicts are shared, so they are
+        copied before secrets are merged in.
+        """
         try:
-            with open(file_path, 'r') as file:
-                config = yaml.safe_load(file) or {}
+            config = copy.deepcopy(load_yaml(file_path) or {})
                 
-            # Also try to load secrets file if it exists
-            secrets_path = os.path.join(os.path.dirname(file_path), "secrets.yaml")
-            if os.path.exists(secrets_path):
-                try:
-                    with open(secrets_path, 'r') as secret_file:
-                        secrets = yaml.safe_load(secret_file) or {}
-                        
-                    # Merge secrets into config (deep merge)
-                    self._merge_dicts(config, secrets)
-                except Exception as e:
-                    logger.error(f"Failed to load secrets from {secrets_path}: {e}")
+            # Also merge in the secrets file if there is one
+            secrets = self._load_secrets(os.path.dirname(file_path))
+            if secrets:
+                # Merge secrets into config (deep merge)
+                self._merge_dicts(config, copy.deepcopy(secrets))
                     
             return config
         except Exception as e:
             logger.error(f"Failed to load {file_path}: {e}")
             return {}
             
+    def _load_secrets(self, directory: str) -> Optional[Dict[str, Any]]:
+        """
+        Load secrets.yaml from a directory, once per directory.
+        
+        Args:
+            directory: Directory of the config file being loaded
+            
+        Returns:
+            Parsed secrets (shared, must not be mutated), or None if the file
+            is missing or unreadable
+        """
+        if directory in self._secrets_by_dir:
+            return self._secrets_by_dir[directory]
+        
+        secrets = None
+        secrets_path = os.path.join(directory, "secrets.yaml")
+        if os.path.exists(secrets_path):
+            try:
+                secrets = load_yaml(secrets_path, use_snapshot=False) or {}
+            except Exception as e:
+                logger.error(f"Failed to load secrets from {secrets_path}: {e}")
+        
+        self._secrets_by_dir[directory] = secrets
+        return secrets
+    
     def _merge_dicts(self, dict1, dict2):
         """
         Recursively merge dict2 into dict1
@@ -128,72 +705,269 @@ class AnalysisEngine:
         Returns:
             List of transcript data with metadata
         """
-        transcripts = []
         cutoff_date = datetime.now().timestamp() - (max_age_days * 86400)
         
-        for filename in os.listdir(self.transcripts_path):
-            if filename.endswith('.json'):
-                try:
-                    with open(os.path.join(self.transcripts_path, filename), 'r') as file:
-                        transcript_data = json.load(file)
-                        
-                        # Parse published_at date and filter by age
-                        try:
-                            published_at = datetime.fromisoformat(transcript_data['published_at'].replace('Z', '+00:00'))
-                            if published_at.timestamp() >= cutoff_date:
-                                transcripts.append(transcript_data)
-                        except (KeyError, ValueError):
-                            # If we can't parse the date, include it anyway
-                            transcripts.append(transcript_data)
-                            
-                except Exception as e:
-                    logger.error(f"Error loading transcript {filename}: {e}")
+        with os.scandir(self.transcripts_path) as entries:
+            filenames = [
+                entry.name for entry in entries
+                if entry.name.endswith('.json') and not self._is_transcript_file_stale(entry, cutoff_date)
+            ]
+        
+        # Only the open/read syscalls release the GIL; parsing and filtering
+        # hold it. The threads overlap file I/O, which is what pays off when
+        # the transcripts are not in the page cache.
+        load = functools.partial(self._load_transcript_file, cutoff_date=cutoff_date)
+        if len(filenames) >= PARALLEL_READ_MIN_FILES:
+            max_workers = min(32, (os.cpu_count() or 1) * 4, len(filenames))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                loaded = list(executor.map(load, filenames))
+        else:
+            loaded = [load(filename) for filename in filenames]
+        
+        transcripts = [transcript_data for transcript_data in loaded if transcript_data is not None]
         
         # Sort by published date, newest first
         transcripts.sort(key=lambda x: x.get('published_at', ''), reverse=True)
         return transcripts
     
-    def _load_price_data(self, symbol: str) -> Dict[str, Any]:
+    def _is_transcript_file_stale(self, entry: os.DirEntry, cutoff_date: float) -> bool:
+        """
+        Tell without parsing it whether a transcript file is older than the cutoff.
+        
+        Only files named {video_id}_{YYYYMMDD}.json carry their publish date;
+        files without a parsable date are never considered stale here, as
+        transcripts without a published_at are kept when loaded.
+        
+        Args:
+            entry: Directory entry of the file in the transcripts directory
+            cutoff_date: Oldest publish timestamp to keep
+            
+        Returns:
+            True if the whole publish day lies before the cutoff, or the file
+            was last written before it
+        """
+        match = _DATED_TRANSCRIPT_RE.match(entry.name)
+        if not match:
+            return False
+        try:
+            published_day = datetime.strptime(match.group(1), "%Y%m%d").replace(tzinfo=timezone.utc)
+        except ValueError:
+            return False
+        if (published_day + timedelta(days=1)).timestamp() <= cutoff_date:
+            return True
+        
+        # A transcript is saved after it is published, so a file last written
+        # before the cutoff cannot hold a recent transcript
+        try:
+            return entry.stat().st_mtime < cutoff_date
+        except FileNotFoundError:
+            # Removed by the fetcher since the directory was listed
+            return True
+    
+    def _load_transcript_file(self, filename: str, cutoff_date: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Load a single transcript file.
+        
+        Args:
+            filename: Name of the file in the transcripts directory
+            cutoff_date: Oldest publish timestamp to keep, or None for any age
+            
+        Returns:
+            Transcript data, or None if the file cannot be read or the
+            transcript was published before the cutoff
+        """
+        try:
+            transcript_data = _read_json(os.path.join(self.transcripts_path, filename))
+            
+            # Parse published_at date and filter by age
+            if cutoff_date is not None:
+                try:
+                    published_at = datetime.fromisoformat(transcript_data['published_at'].replace('Z', '+00:00'))
+                    if published_at.timestamp() < cutoff_date:
+                        return None
+                except (KeyError, ValueError):
+                    # If we can't parse the date, include it anyway
+                    pass
+            
+            # Lowercase the segments once here rather than on every extraction
+            transcript_data[_LOWERED_SEGMENTS_KEY] = _lowered_segments(transcript_data)
+            return transcript_data
+        except Exception as e:
+            logger.error(f"Error loading transcript {filename}: {e}")
+            return None
+    
+    def _get_transcripts(self, current_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get recent transcripts, reusing the last load while nothing changed.
+        
+        Transcripts are reloaded when a file is added to or removed from the
+        transcripts directory, or on a new day so the age cutoff moves on.
+        
+        Args:
+            current_date: Date of the run as YYYY-MM-DD (default: today)
+            
+        Returns:
+            List of transcript data with metadata, newest first
+        """
+        try:
+            dir_mtime = os.stat(self.transcripts_path).st_mtime_ns
+        except OSError:
+            dir_mtime = None
+        today = current_date or _current_date()
+        
+        cached = self._transcripts_cache
+        if cached and dir_mtime is not None and cached[0] == dir_mtime and cached[1] == today:
+            return cached[2]
+        
+        transcripts = self._load_transcripts()
+        self._transcripts_cache = (dir_mtime, today, transcripts)
+        return transcripts
+    
+    def _latest_files(self, directory: str, kinds: Tuple[str, ...]) -> Dict[Tuple[str, str], str]:
+        """
+        Index the newest data file per symbol and kind in a directory.
+        
+        Data files are named {symbol}_{kind}_{YYYY-MM-DD}.json, so the newest
+        file sorts last. The directory is scanned once and rescanned only when
+        its modification time changes, i.e. when files are added or removed.
+        
+        Args:
+            directory: Directory to index
+            kinds: File kinds to index (e.g. "current", "historical")
+            
+        Returns:
+            Dictionary of (symbol, kind) -> path of the newest file
+        """
+        try:
+            dir_mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return {}
+        
+        cached = self._file_indexes.get((directory, kinds))
+        if cached and cached[0] == dir_mtime:
+            return cached[1]
+        
+        markers = [(kind, f"_{kind}_") for kind in kinds]
+        index = {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.endswith('.json'):
+                    continue
+                for kind, marker in markers:
+                    if marker in name:
+                        # Paths of one (symbol, kind) differ only in the date,
+                        # so they order like the file names
+                        key = (name.split(marker, 1)[0], kind)
+                        path = entry.path
+                        if path > index.get(key, ''):
+                            index[key] = path
+                        break
+        
+        self._file_indexes[(directory, kinds)] = (dir_mtime, index)
+        return index
+    
+    def _load_price_data(self, symbol: str, include_historical: bool = True) -> Dict[str, Any]:
         """
         Load latest price data for a symbol.
         
         Args:
             symbol: Asset symbol
+            include_historical: Whether to load the historical prices, which
+                are much larger than the current price
             
         Returns:
-            Dictionary with current and historical price data
+            Dictionary with current and historical price data; the price data
+            is shared with later calls and must not be mutated
         """
         result = {
             "current": None,
             "historical": []
         }
         
+        latest_files = self._latest_files(self.prices_path, ("current", "historical"))
+        
         # Find the most recent current price file
-        current_files = [f for f in os.listdir(self.prices_path) 
-                        if f.startswith(f"{symbol}_current_") and f.endswith('.json')]
-        if current_files:
-            # Get the most recent file based on filename date
-            latest_file = sorted(current_files, reverse=True)[0]
+        latest_file = latest_files.get((symbol, "current"))
+        if latest_file:
             try:
-                with open(os.path.join(self.prices_path, latest_file), 'r') as file:
-                    result["current"] = json.load(file)
+                result["current"] = self._read_price_file((symbol, "current"), latest_file)
             except Exception as e:
                 logger.error(f"Error loading current price data for {symbol}: {e}")
         
         # Find the most recent historical price file
-        historical_files = [f for f in os.listdir(self.prices_path) 
-                           if f.startswith(f"{symbol}_historical_") and f.endswith('.json')]
-        if historical_files:
-            # Get the most recent file based on filename date
-            latest_file = sorted(historical_files, reverse=True)[0]
+        latest_file = latest_files.get((symbol, "historical")) if include_historical else None
+        if latest_file:
             try:
-                with open(os.path.join(self.prices_path, latest_file), 'r') as file:
-                    result["historical"] = json.load(file)
+                result["historical"] = self._read_price_file((symbol, "historical"), latest_file)
             except Exception as e:
                 logger.error(f"Error loading historical price data for {symbol}: {e}")
         
         return result
     
+    def _read_price_file(self, key: Tuple[str, str], file_path: str) -> Any:
+        """
+        Read a price file, reusing the last parse while the file is unchanged.
+        
+        Price files of the current day are rewritten by every fetch, so the
+        file's own modification time decides whether to parse it again.
+        
+        Args:
+            key: (symbol, kind) the file holds
+            file_path: Path of the newest file for the key
+            
+        Returns:
+            Parsed price data
+        """
+        mtime_ns = os.stat(file_path).st_mtime_ns
+        cached = self._price_files.get(key)
+        if cached and cached[0] == file_path and cached[1] == mtime_ns:
+            return cached[2]
+        
+        data = _read_json(file_path)
+        self._price_files[key] = (file_path, mtime_ns, data)
+        return data
+    
+    def _build_asset_index(self) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """
+        Index the configured assets by symbol.
+        
+        Returns:
+            Dictionary of symbol -> (category, asset info), see index_assets
+        """
+        return index_assets(self.assets)
+    
+    def _build_narrative_keywords(self) -> Dict[str, FrozenSet[str]]:
+        """
+        Map each asset symbol to the lowercase keywords of the narratives affecting it.
+        
+        Returns:
+            Dictionary of symbol -> set of lowercase keywords
+        """
+        keywords_by_symbol: Dict[str, set] = {}
+        for narrative in self.narratives.get('narratives', []):
+            keywords = [k.lower() for k in narrative.get('keywords', [])]
+            for symbol in narrative.get('assets_affected', []):
+                keywords_by_symbol.setdefault(symbol, set()).update(keywords)
+        
+        return {symbol: frozenset(keywords) for symbol, keywords in keywords_by_symbol.items()}
+    
+    def _asset_keywords(self, symbol: str, asset_info: Dict[str, Any]) -> FrozenSet[str]:
+        """
+        Get the lowercase keywords that mark transcript content as relevant to an asset.
+        
+        Args:
+            symbol: Asset symbol
+            asset_info: Asset information from config
+            
+        Returns:
+            Set of lowercase keywords
+        """
+        keywords = frozenset((symbol.lower(), asset_info.get('name', '').lower()))
+        
+        # Add keywords from related narratives
+        return keywords | self._narrative_keywords.get(symbol, frozenset())
+    
     def _extract_relevant_transcript_content(self, transcripts: List[Dict[str, Any]], 
                                           symbol: str, asset_info: Dict[str, Any]) -> str:
         """
@@ -207,43 +981,175 @@ class AnalysisEngine:
         Returns:
             String with relevant transcript content
         """
-        # Get keywords for this asset
-        keywords = [symbol.lower(), asset_info.get('name', '').lower()]
+        return self._extract_relevant_content_batch(transcripts, {symbol: asset_info})[symbol]
+    
+    def _extract_relevant_content_batch(self, transcripts: List[Dict[str, Any]],
+                                        assets: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Extract content from transcripts that's relevant to each of several assets.
         
-        # Add keywords from related narratives
-        for narrative in self.narratives.get('narratives', []):
-            if symbol in narrative.get('assets_affected', []):
-                keywords.extend([k.lower() for k in narrative.get('keywords', [])])
+        The transcripts are walked once and each segment is lowercased once,
+        then matched against the keywords of all assets at the same time.
         
-        # Remove duplicates
-        keywords = list(set(keywords))
+        Args:
+            transcripts: List of transcript data
+            assets: Dictionary of symbol -> asset information from config
+            
+        Returns:
+            Dictionary of symbol -> string with relevant transcript content
+        """
+        # Match all assets' keywords in a single pass per segment
+        matching_symbols = _symbols_matcher(tuple(sorted(
+            (symbol, self._asset_keywords(symbol, asset_info)) for symbol, asset_info in assets.items()
+        )))
+        relevant_segments = {symbol: [] for symbol in assets}
         
-        relevant_segments = []
+        # Segments already included per asset; re-uploads and repeated lines
+        # would otherwise be sent to the model several times
+        seen_segments = {symbol: set() for symbol in assets}
         
         # Extract relevant segments from transcripts
         for transcript in transcripts:
-            video_segments = []
+            video_segments = {symbol: [] for symbol in assets}
             
-            for segment in transcript.get('transcript', []):
-                text = segment.get('text', '').lower()
-                
-                # Check if the segment contains any of the keywords
-                if any(keyword in text for keyword in keywords):
-                    video_segments.append(segment.get('text', ''))
-            
-            if video_segments:
-                video_info = (
-                    f"Video: {transcript.get('title', 'Unknown')}\n"
-                    f"Channel: {transcript.get('channel', 'Unknown')}\n"
-                    f"Date: {transcript.get('published_at', 'Unknown')}\n\n"
-                )
-                video_content = "\n".join(video_segments)
-                relevant_segments.append(f"{video_info}{video_content}\n\n{'='*50}\n\n")
+            lowered = transcript.get(_LOWERED_SEGMENTS_KEY)
+            if lowered is None:
+                lowered = _lowered_segments(transcript)
+            
+            for original_text, text in lowered:
+                # Add the segment to every asset it mentions
+                for symbol in matching_symbols(text):
+                    seen = seen_segments[symbol]
+                    if original_text not in seen:
+                        seen.add(original_text)
+                        video_segments[symbol].append(original_text)
+            
+            video_info = (
+                f"Video: {transcript.get('title', 'Unknown')}\n"
+                f"Channel: {transcript.get('channel', 'Unknown')}\n"
+                f"Date: {transcript.get('published_at', 'Unknown')}\n\n"
+            )
+            for symbol, segments in video_segments.items():
+                if segments:
+                    video_content = "\n".join(segments)
+                    relevant_segments[symbol].append(f"{video_info}{video_content}\n\n{'='*50}\n\n")
+        
+        results = {}
+        for symbol, segments in relevant_segments.items():
+            if not segments:
+                results[symbol] = f"No relevant content found for {symbol} in the transcripts."
+                continue
+            
+            # Transcripts are newest first, so the cap drops the oldest content
+            content = "".join(segments)
+            if len(content) > self.max_prompt_chars:
+                logger.info(f"Truncated transcript content for {symbol} from {len(content)} to {self.max_prompt_chars} chars")
+                content = content[:self.max_prompt_chars]
+            results[symbol] = content
+        
+        return results
+    
+    def _create_completion(self, **kwargs) -> Any:
+        """
+        Create a chat completion, waiting for a free request slot first.
+        
+        At most max_concurrent_requests calls are in flight at once, however
+        many analyses run concurrently.
+        
+        Args:
+            **kwargs: Arguments for chat.completions.create
+            
+        Returns:
+            Chat completion response
+        """
+        with self._api_slots:
+            return self.client.chat.completions.create(**kwargs)
+    
+    def _llm_cache_path(self, *key_parts: Any) -> str:
+        """
+        Get the cache file for a DeepSeek request.
+        
+        Args:
+            *key_parts: Everything the response depends on (model, prompts, ...)
+            
+        Returns:
+            Path of the cache file named by the SHA-256 of the key parts
+        """
+        key = json.dumps(key_parts, sort_keys=True, default=str).encode('utf-8')
+        return os.path.join(self._llm_cache_dir, f"{hashlib.sha256(key).hexdigest()}.json")
+    
+    def _cached_response(self, cache_path: str) -> Optional[Any]:
+        """
+        Get a cached DeepSeek response younger than the cache TTL.
+        
+        Args:
+            cache_path: Cache file from _llm_cache_path
+            
+        Returns:
+            The cached response, or None on a miss
+        """
+        if self.llm_cache_ttl <= 0:
+            return None
+        try:
+            if time.time() - os.stat(cache_path).st_mtime >= self.llm_cache_ttl:
+                return None
+            return _read_json(cache_path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable response cache {cache_path}: {e}")
+            return None
+    
+    def _prune_llm_cache(self) -> int:
+        """
+        Delete cached DeepSeek responses older than the cache TTL.
+        
+        Responses are keyed by their prompt, which changes with the transcripts
+        and prices, so expired entries are rarely requested again and would
+        otherwise pile up.
+        
+        Returns:
+            Number of cache files deleted
+        """
+        if self.llm_cache_ttl <= 0:
+            return 0
+        
+        cutoff = time.time() - self.llm_cache_ttl
+        removed = 0
+        try:
+            with os.scandir(self._llm_cache_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.json'):
+                        continue
+                    try:
+                        if entry.stat().st_mtime <= cutoff:
+                            os.remove(entry.path)
+                            removed += 1
+                    except FileNotFoundError:
+                        pass
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            logger.warning(f"Failed to prune response cache {self._llm_cache_dir}: {e}")
         
-        if not relevant_segments:
-            return f"No relevant content found for {symbol} in the transcripts."
+        if removed:
+            logger.info(f"Removed {removed} expired DeepSeek responses from the cache")
+        return removed
+    
+    def _cache_response(self, cache_path: str, response: Any) -> None:
+        """
+        Store a parsed DeepSeek response in the cache.
         
-        return "".join(relevant_segments)
+        Args:
+            cache_path: Cache file from _llm_cache_path
+            response: JSON-serializable response to store
+        """
+        if self.llm_cache_ttl <= 0:
+            return
+        try:
+            _write_atomic(cache_path, _dump_json(response))
+        except Exception as e:
+            logger.warning(f"Failed to cache DeepSeek response: {e}")
     
     def _query_deepseek_r1(self, prompt: str) -> Optional[Dict[str, Any]]:
         """
@@ -255,36 +1161,23 @@ class AnalysisEngine:
         Returns:
             Structured analysis data or None if the request fails
         """
-        if not self.analysis_client:
+        if not self.client:
             logger.warning("DeepSeek analysis client not initialized, using dummy implementation")
             return self._dummy_query_deepseek_r1(prompt)
+        
+        cache_path = self._llm_cache_path(self.deepseek_r1_model, _ANALYST_SYSTEM_PROMPT, prompt)
+        cached = self._cached_response(cache_path)
+        if cached is not None:
+            logger.info("Using cached DeepSeek R1 response")
+            return cached
             
         try:
             logger.info(f"Sending prompt to DeepSeek R1 (length: {len(prompt)} chars)")
             
-            response = self.analysis_client.chat.completions.create(
+            response = self._create_completion(
                 model=self.deepseek_r1_model,
                 messages=[
-                    {
-                        "role": "system", 
-                        "content": """You are a professional financial analyst specialized in cryptocurrency and stock markets. 
-                        Analyze the provided data and output a structured analysis in this exact JSON format:
-                        {
-                            "sentiment": "bullish|neutral|bearish",
-                            "confidence": "high|medium|low",
-                            "key_points": ["point1", "point2", "point3", ...],
-                            "price_forecast": {
-                                "short_term": "text forecast for 1-2 weeks",
-                                "medium_term": "text forecast for 1-3 months"
-                            },
-                            "recommendation": "buy|sell|hold",
-                            "risk_factors": ["risk1", "risk2", "risk3", ...],
-                            "trading_strategy": "detailed trading strategy text",
-                            "entry_points": [price1, price2, ...],
-                            "exit_points": [price1, price2, ...],
-                            "analysis_text": "full text analysis with all details"
-                        }"""
-                    },
+                    {"role": "system", "content": _ANALYST_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
@@ -296,200 +1189,153 @@ class AnalysisEngine:
             analysis_json = response.choices[0].message.content
             
             try:
-                analysis_data = json.loads(analysis_json)
+                analysis_data = _loads(analysis_json)
                 logger.info(f"Successfully parsed JSON response from DeepSeek R1")
-                return analysis_data
             except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON from DeepSeek R1: {e}")
-                logger.error(f"Raw response: {analysis_json[:500]}...")
-                return self._dummy_query_deepseek_r1(prompt)
-            
-        except Exception as e:
-            logger.error(f"Error querying DeepSeek R1 API: {e}")
-            logger.warning("Falling back to dummy implementation")
-            return self._dummy_query_deepseek_r1(prompt)
-            
-    def _dummy_query_deepseek_r1(self, prompt: str) -> Dict[str, Any]:
-        """
-        Dummy implementation of DeepSeek R1 API for fallback.
-        
-        Args:
-            prompt: Prompt that would be sent to DeepSeek
+                # Salvage slightly malformed output rather than discarding the call
+                try:
+                    analysis_data = _loads(_repair_json(analysis_json))
+                    logger.info(f"Repaired malformed JSON response from DeepSeek R1 ({e})")
+                except json.JSONDecodeError:
+                    logger.error(f"Failed to parse JSON from DeepSeek R1: {e}")
+                    logger.error(f"Raw response: {analysis_json[:500]}...")
+                    return self._dummy_query_deepseek_r1(prompt)
             
-        Returns:
-            Dummy structured analysis based on asset symbol
-        """
-        logger.info(f"Using dummy DeepSeek R1 implementation (prompt length: {len(prompt)} chars)")
-        
-        # Extract the symbol from the prompt for dummy response
-        symbol = None
-        if "BTC" in prompt:
-            symbol = "BTC"
-        elif "ETH" in prompt:
-            symbol = "ETH"
-        elif "SOL" in prompt:
-            symbol = "SOL"
-        else:
-            # Try to find other common crypto symbols
-            for crypto in ["XRP", "ADA", "DOT", "DOGE", "LINK", "XMR", "KAS"]:
-                if crypto in prompt:
-                    symbol = crypto
-                    break
-        
-        # Generate response based on symbol
-        if symbol == "BTC":
-            return {
-                "sentiment": "bullish",
-                "confidence": "high",
-                "key_points": [
-                    "Strong institutional adoption trend continuing in 2025",
-                    "Technical analysis shows support at current levels with resistance at $70,000",
-                    "Market narratives around Bitcoin as an inflation hedge remain strong",
-                    "Recent regulatory clarity has been generally positive for Bitcoin"
-                ],
-                "price_forecast": {
-                    "short_term": "Likely to test $70,000 resistance level",
-                    "medium_term": "Potential for new all-time highs if current support holds"
-                },
-                "recommendation": "buy",
-                "risk_factors": [
-                    "Potential regulatory changes in major markets",
-                    "Macroeconomic factors affecting risk assets broadly",
-                    "Technical resistance at $70,000 could lead to short-term rejection"
-                ],
-                "trading_strategy": "Accumulate at current prices. Set buy orders at support levels around $64,000-$65,000. Take partial profits at $70,000 and $75,000 levels.",
-                "entry_points": [64000, 65000],
-                "exit_points": [70000, 75000],
-                "analysis_text": """
-Analysis for Bitcoin (BTC):
-
-Sentiment: Bullish
-Confidence: High
-
-Key Points:
-1. Multiple influencers have highlighted the strong institutional adoption trend continuing in 2025.
-2. Technical analysis shows support at current levels with resistance at $70,000.
-3. Market narratives around Bitcoin as an inflation hedge remain strong.
-4. Recent regulatory clarity has been generally positive for Bitcoin.
-
-Price Forecast:
-- Short-term (1-2 weeks): Likely to test $70,000 resistance level
-- Medium-term (1-3 months): Potential for new all-time highs if current support holds
-
-Recommendation:
-ACCUMULATE at current prices. Consider setting buy orders at support levels around $64,000-$65,000. 
-Set take-profit orders at $70,000 and $75,000 levels.
-
-Risk Factors:
-- Potential regulatory changes in major markets
-- Macroeconomic factors affecting risk assets broadly
-- Technical resistance at $70,000 could lead to short-term rejection
-
-Trading Strategy:
-- Maintain current position
-- Consider adding 5-10% to position at support levels
-- Take partial profits at resistance levels
-"""
-            }
-        elif symbol == "ETH":
-            return {
-                "sentiment": "neutral",
-                "confidence": "medium",
-                "key_points": [
-                    "The recent Ethereum upgrade has positive long-term implications",
-                    "DeFi activity on Ethereum has been increasing steadily",
-                    "Competition from alternative L1s remains a concern for market share",
-                    "Technical analysis shows a consolidation pattern forming"
-                ],
-                "price_forecast": {
-                    "short_term": "Likely to remain in the $3300-$3600 range",
-                    "medium_term": "Potential upside to $4000+ if broader crypto market remains strong"
-                },
-                "recommendation": "hold",
-                "risk_factors": [
-                    "Technical issues with recent upgrade could impact sentiment",
-                    "Continued gas fee concerns affecting user experience",
-                    "Competition from alternative L1 blockchains"
-                ],
-                "trading_strategy": "Hold current position. Consider adding on dips below $3200. Set buy orders at $3200 and $3000 levels.",
-                "entry_points": [3000, 3200],
-                "exit_points": [4000, 4200],
-                "analysis_text": """
-Analysis for Ethereum (ETH):
-
-Sentiment: Neutral to Bullish
-Confidence: Medium
-
-Key Points:
-1. The recent Ethereum upgrade has positive long-term implications but short-term impact is uncertain.
-2. DeFi activity on Ethereum has been increasing steadily.
-3. Competition from alternative L1s remains a concern for market share.
-4. Technical analysis shows a consolidation pattern forming.
-
-Price Forecast:
-- Short-term (1-2 weeks): Likely to remain in the $3300-$3600 range
-- Medium-term (1-3 months): Potential upside to $4000+ if broader crypto market remains strong
-
-Recommendation:
-HOLD current position. Consider adding on dips below $3200.
-
-Risk Factors:
-- Technical issues with recent upgrade could impact sentiment
-- Continued gas fee concerns affecting user experience
-- Competition from alternative L1 blockchains
-
-Trading Strategy:
-- Maintain current position
-- Set buy orders at support levels ($3200, $3000)
-- Consider rebalancing if ETH/BTC ratio falls further
-"""
-            }
-        else:
-            return {
-                "sentiment": "neutral",
-                "confidence": "low",
-                "key_points": [
-                    "Insufficient data to make a strong recommendation",
-                    "Market conditions remain uncertain",
-                    "Technical indicators are mixed"
-                ],
-                "price_forecast": {
-                    "short_term": "Uncertain short-term outlook",
-                    "medium_term": "Direction will depend on broader market conditions"
-                },
-                "recommendation": "hold",
-                "risk_factors": [
-                    "High market volatility",
-                    "Limited information available",
-                    "Uncertain regulatory environment"
-                ],
-                "trading_strategy": "Hold current position until more data becomes available. Monitor market conditions closely.",
-                "entry_points": [],
-                "exit_points": [],
-                "analysis_text": """
-Analysis:
-
-Sentiment: Neutral
-Confidence: Low
-
-Key Points:
-1. Insufficient data to make a strong recommendation.
-2. Market conditions remain uncertain.
-3. Technical indicators are mixed.
-
-Recommendation:
-HOLD current position until more data becomes available.
-
-Risk Factors:
-- High market volatility
-- Limited information available
-
-Trading Strategy:
-- Wait for more clear signals before taking action
-- Monitor market conditions closely
-"""
-            }
+            self._cache_response(cache_path, analysis_data)
+            return analysis_data
+            
+        except Exception as e:
+            logger.error(f"Error querying DeepSeek R1 API: {e}")
+            logger.warning("Falling back to dummy implementation")
+            return self._dummy_query_deepseek_r1(prompt)
+            
+    def _dummy_query_deepseek_r1(self, prompt: str) -> Dict[str, Any]:
+        """
+        Dummy implementation of DeepSeek R1 API for fallback.
+        
+        Args:
+            prompt: Prompt that would be sent to DeepSeek
+            
+        Returns:
+            Dummy structured analysis based on asset symbol
+        """
+        logger.info(f"Using dummy DeepSeek R1 implementation (prompt length: {len(prompt)} chars)")
+        
+        # Extract the symbol from the prompt for dummy response
+        symbol = next((symbol for symbol in _DUMMY_ANALYSES if symbol in prompt), None)
+        
+        # Top-level copy so callers can add keys; nested values are shared
+        return dict(_DUMMY_ANALYSES.get(symbol, _DEFAULT_DUMMY_ANALYSIS))
 
+    def _decision_cache_path(self, analysis_data: Dict[str, Any], symbol: str, current_price: float) -> str:
+        """
+        Get the cache file for the V3 trading decision on an analysis.
+        
+        Prices within about 1% of each other share cached decisions.
+        """
+        price_bucket = round(math.log(current_price, 1.01)) if current_price > 0 else 0
+        return self._llm_cache_path(
+            self.deepseek_v3_model, _EXECUTOR_SYSTEM_PROMPT, symbol, price_bucket, _decision_inputs(analysis_data)
+        )
+    
+    def _skips_v3(self, analysis_data: Dict[str, Any]) -> bool:
+        """
+        Tell whether an analysis is clear-cut enough to decide without V3.
+        
+        Args:
+            analysis_data: The structured analysis from DeepSeek R1
+            
+        Returns:
+            True if all fields of any skip_v3_when rule match the analysis
+        """
+        for rule in self.skip_v3_when:
+            if all(str(analysis_data.get(field, '')).lower() == str(value).lower() for field, value in rule.items()):
+                return True
+        return False
+    
+    def _process_analyses_with_v3(self, pending: Dict[str, Tuple[Dict[str, Any], float]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get trading decisions for several analyses from a single V3 request.
+        
+        The model is asked to call place_market_order once per asset. Assets
+        it skips or answers with invalid arguments, and every asset if the
+        request fails, go through _process_analysis_with_v3 one by one.
+        
+        Args:
+            pending: Dictionary of symbol -> (analysis data, current price)
+            
+        Returns:
+            Dictionary of symbol -> function call result with trading decision
+        """
+        decisions = {}
+        to_request = {}
+        for symbol, (analysis_data, current_price) in pending.items():
+            if self._skips_v3(analysis_data):
+                logger.info(f"Skipping DeepSeek V3 for {symbol}, decision follows from the analysis")
+                decisions[symbol] = self._dummy_process_analysis(analysis_data, symbol, current_price)
+                continue
+            
+            cached = self._cached_response(self._decision_cache_path(analysis_data, symbol, current_price))
+            if cached is not None:
+                logger.info(f"Using cached DeepSeek V3 decision for {symbol}")
+                decisions[symbol] = cached
+            else:
+                to_request[symbol] = (analysis_data, current_price)
+        
+        if self.client and len(to_request) > 1:
+            try:
+                logger.info(f"Processing {len(to_request)} analyses with one DeepSeek V3 request")
+                
+                assets = [
+                    {"symbol": symbol, "current_price": current_price, "analysis": _decision_inputs(analysis_data)}
+                    for symbol, (analysis_data, current_price) in to_request.items()
+                ]
+                response = self._create_completion(
+                    model=self.deepseek_v3_model,
+                    messages=[
+                        {"role": "system", "content": _EXECUTOR_SYSTEM_PROMPT},
+                        {
+                            "role": "user",
+                            "content": (
+                                f"Analysis data for {len(assets)} assets:\n{_dumps(assets)}\n\n"
+                                "For each asset, determine whether to buy, sell, or hold it, and call the "
+                                "place_market_order function once per asset with your decision."
+                            )
+                        }
+                    ],
+                    tools=[_PLACE_ORDER_TOOL],
+                    tool_choice="auto",
+                    temperature=0.2,
+                    max_tokens=min(4000, 300 * len(assets))
+                )
+                
+                message = response.choices[0].message
+                for tool_call in message.tool_calls or []:
+                    try:
+                        function_args = self._validate_order_args(_loads(tool_call.function.arguments))
+                    except json.JSONDecodeError as e:
+                        logger.error(f"Failed to parse function arguments from V3: {e}")
+                        continue
+                    symbol = function_args.get("symbol") if function_args else None
+                    if symbol not in to_request or symbol in decisions:
+                        continue
+                    
+                    decisions[symbol] = {
+                        "function": tool_call.function.name,
+                        "arguments": function_args,
+                        "model_response": message.content
+                    }
+                    analysis_data, current_price = to_request[symbol]
+                    self._cache_response(self._decision_cache_path(analysis_data, symbol, current_price), decisions[symbol])
+            except Exception as e:
+                logger.error(f"Error processing batched analyses with DeepSeek V3: {e}")
+        
+        for symbol, (analysis_data, current_price) in to_request.items():
+            if symbol not in decisions:
+                decisions[symbol] = self._process_analysis_with_v3(analysis_data, symbol, current_price)
+        
+        return decisions
+    
     def _process_analysis_with_v3(self, analysis_data: Dict[str, Any], symbol: str, current_price: float) -> Dict[str, Any]:
         """
         Process the analysis using DeepSeek V3 for function calling.
@@ -502,49 +1348,29 @@ Trading Strategy:
         Returns:
             Function call result with trading decision
         """
-        if not self.execution_client:
+        if not self.client:
             logger.warning("DeepSeek execution client not initialized, using dummy implementation")
             return self._dummy_process_analysis(analysis_data, symbol, current_price)
         
+        if self._skips_v3(analysis_data):
+            logger.info(f"Skipping DeepSeek V3 for {symbol}, decision follows from the analysis")
+            return self._dummy_process_analysis(analysis_data, symbol, current_price)
+        
+        cache_path = self._decision_cache_path(analysis_data, symbol, current_price)
+        cached = self._cached_response(cache_path)
+        if cached is not None:
+            logger.info(f"Using cached DeepSeek V3 decision for {symbol}")
+            return cached
+        
         try:
             logger.info(f"Processing analysis with DeepSeek V3 for {symbol}")
             
             # Define the tools for function calling
-            tools = [
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "place_market_order",
-                        "description": "Execute a market order for asset trading",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "symbol": {"type": "string", "description": "The asset symbol (e.g., BTC, ETH)"},
-                                "action": {"type": "string", "enum": ["buy", "sell", "hold"], "description": "Trading action to take"},
-                                "allocation_percentage": {"type": "number", "description": "Percentage of portfolio AUM to allocate (1-15%)"},
-                                "confidence": {"type": "string", "enum": ["high", "medium", "low"], "description": "Confidence level in the decision"},
-                                "reason": {"type": "string", "description": "Rationale for the trading decision"}
-                            },
-                            "required": ["symbol", "action", "confidence", "reason"]
-                        }
-                    }
-                }
-            ]
+            tools = [_PLACE_ORDER_TOOL]
             
             # Construct message for V3 model
             messages = [
-                {
-                    "role": "system",
-                    "content":                     """You are a trading executor that converts financial analysis into concrete trading actions.
-                    Based on the analysis provided, determine whether to buy, sell, or hold the asset.
-                    For buy/sell decisions, determine an appropriate portfolio allocation percentage based on confidence level:
-                    - High confidence: Consider larger allocations (10-15% of portfolio)
-                    - Medium confidence: Consider moderate allocations (5-8% of portfolio)
-                    - Low confidence: Consider smaller allocations (1-3% of portfolio) or holding
-                    
-                    Always provide a clear rationale for your decision. Keep allocation percentages within prudent risk management guidelines.
-                    """
-                },
+                {"role": "system", "content": _EXECUTOR_SYSTEM_PROMPT},
                 {
                     "role": "user",
                     "content": f"""
@@ -552,7 +1378,7 @@ Trading Strategy:
                     Current price: ${current_price}
                     
                     Analysis data:
-                    {json.dumps(analysis_data, indent=2)}
+                    {_dumps(_decision_inputs(analysis_data))}
                     
                     Based on this analysis, determine whether to buy, sell, or hold {symbol}, and if buying or selling, 
                     determine an appropriate USD amount. Call the place_market_order function with your decision.
@@ -561,7 +1387,7 @@ Trading Strategy:
             ]
             
             # Call V3 model with function calling
-            response = self.execution_client.chat.completions.create(
+            response = self._create_completion(
                 model=self.deepseek_v3_model,
                 messages=messages,
                 tools=tools,
@@ -580,29 +1406,21 @@ Trading Strategy:
             function_name = function_call.function.name
             
             try:
-                function_args = json.loads(function_call.function.arguments)
+                function_args = _loads(function_call.function.arguments)
                 logger.info(f"V3 model called {function_name} with args: {function_args}")
                 
-                # Validate required fields
-                if "action" not in function_args or "symbol" not in function_args:
+                function_args = self._validate_order_args(function_args)
+                if function_args is None:
                     logger.warning(f"Missing required fields in function call for {symbol}")
                     return self._dummy_process_analysis(analysis_data, symbol, current_price)
                 
-                # Ensure allocation_percentage is present for buy/sell actions
-                if function_args["action"] in ["buy", "sell"] and "allocation_percentage" not in function_args:
-                    # Set default allocation based on confidence
-                    if function_args.get("confidence") == "high":
-                        function_args["allocation_percentage"] = 10  # 10% default for high confidence
-                    elif function_args.get("confidence") == "medium":
-                        function_args["allocation_percentage"] = 5   # 5% default for medium confidence
-                    else:
-                        function_args["allocation_percentage"] = 2   # 2% default for low confidence
-                
-                return {
+                result = {
                     "function": function_name,
                     "arguments": function_args,
                     "model_response": response.choices[0].message.content
                 }
+                self._cache_response(cache_path, result)
+                return result
                 
             except json.JSONDecodeError as e:
                 logger.error(f"Failed to parse function arguments from V3: {e}")
@@ -613,6 +1431,97 @@ Trading Strategy:
             logger.warning("Falling back to dummy implementation")
             return self._dummy_process_analysis(analysis_data, symbol, current_price)
     
+    def _validate_order_args(self, function_args: Any) -> Optional[Dict[str, Any]]:
+        """
+        Check place_market_order arguments from the model and fill in defaults.
+        
+        Args:
+            function_args: Arguments parsed from the model response
+            
+        Returns:
+            The arguments with allocation_percentage set for buy/sell actions,
+            or None if required fields are missing
+        """
+        # Validate required fields
+        if not isinstance(function_args, dict) or "action" not in function_args or "symbol" not in function_args:
+            return None
+        
+        # Ensure allocation_percentage is present for buy/sell actions
+        if function_args["action"] in ["buy", "sell"] and "allocation_percentage" not in function_args:
+            # Set default allocation based on confidence
+            if function_args.get("confidence") == "high":
+                function_args["allocation_percentage"] = 10  # 10% default for high confidence
+            elif function_args.get("confidence") == "medium":
+                function_args["allocation_percentage"] = 5   # 5% default for medium confidence
+            else:
+                function_args["allocation_percentage"] = 2   # 2% default for low confidence
+        
+        return function_args
+    
+    def _analyze_and_decide(self, symbol: str, prompt: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Get the analysis and the trading decision from a single DeepSeek request.
+        
+        This saves the second round trip of the R1 -> V3 path, and the model
+        decides from its own analysis instead of a re-serialized copy.
+        
+        Args:
+            symbol: The asset symbol
+            prompt: Analysis prompt for the asset
+            
+        Returns:
+            Tuple of (analysis data, function call result), or None if the
+            request fails or the response is incomplete
+        """
+        if not self.client:
+            return None
+        
+        cache_path = self._llm_cache_path(self.deepseek_r1_model, _COMBINED_SYSTEM_PROMPT, prompt)
+        cached = self._cached_response(cache_path)
+        if cached is not None:
+            logger.info(f"Using cached combined analysis for {symbol}")
+            return cached["analysis"], cached["function_call"]
+        
+        try:
+            logger.info(f"Sending combined analysis request for {symbol} (length: {len(prompt)} chars)")
+            
+            response = self._create_completion(
+                model=self.deepseek_r1_model,
+                messages=[
+                    {"role": "system", "content": _COMBINED_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=2000,
+                response_format={"type": "json_object"}
+            )
+            content = response.choices[0].message.content
+            try:
+                analysis_data = _loads(content)
+            except json.JSONDecodeError as e:
+                analysis_data = _loads(_repair_json(content))
+                logger.info(f"Repaired malformed JSON in combined analysis for {symbol} ({e})")
+        except Exception as e:
+            logger.warning(f"Combined analysis request failed for {symbol}: {e}")
+            return None
+        
+        if not isinstance(analysis_data, dict) or not analysis_data.get("recommendation"):
+            logger.warning(f"Combined analysis for {symbol} has no recommendation")
+            return None
+        
+        function_args = self._validate_order_args(analysis_data.pop("trading_decision", None))
+        if function_args is None:
+            logger.warning(f"Combined analysis for {symbol} has no valid trading decision")
+            return None
+        
+        function_call = {
+            "function": "place_market_order",
+            "arguments": function_args,
+            "model_response": "Trading decision returned with the analysis"
+        }
+        self._cache_response(cache_path, {"analysis": analysis_data, "function_call": function_call})
+        return analysis_data, function_call
+    
     def _dummy_process_analysis(self, analysis_data: Dict[str, Any], symbol: str, current_price: float) -> Dict[str, Any]:
         """
         Dummy implementation for function calling based on analysis.
@@ -661,30 +1570,36 @@ Trading Strategy:
             "model_response": "Dummy function call based on analysis"
         }
 
-    def analyze_asset(self, symbol: str) -> Dict[str, Any]:
+    def analyze_asset(self, symbol: str, transcripts: List[Dict[str, Any]] = None,
+                      relevant_content: str = None) -> Dict[str, Any]:
         """
         Analyze a single asset using available data, then generate trading decisions.
         
         Args:
             symbol: Asset symbol to analyze
+            transcripts: Already loaded transcripts, or None to load them
+            relevant_content: Transcript content already extracted for this
+                asset, or None to extract it from the transcripts
             
         Returns:
             Analysis results dictionary with trading decision
         """
+        return self._analyze_asset(symbol, transcripts, relevant_content, decide=True, current_date=_current_date())
+    
+    def _analyze_asset(self, symbol: str, transcripts: Optional[List[Dict[str, Any]]],
+                       relevant_content: Optional[str], decide: bool, current_date: str) -> Dict[str, Any]:
+        """
+        Analyze a single asset, see analyze_asset.
+        
+        With decide=False, an analysis that did not come with a trading
+        decision is returned unsaved with trading_decision set to None, so
+        the caller can batch the V3 requests and save it via _finish_analysis.
+        current_date (YYYY-MM-DD) dates the prompt and the result.
+        """
         logger.info(f"Analyzing asset: {symbol}")
         
         # Find asset info
-        asset_info = {}
-        asset_type = None
-        
-        for asset_category in ['crypto', 'stocks']:
-            for asset in self.assets.get(asset_category, []):
-                if asset.get('symbol') == symbol:
-                    asset_info = asset
-                    asset_type = asset_category
-                    break
-            if asset_info:
-                break
+        asset_type, asset_info = self._asset_index.get(symbol, (None, None))
                 
         if not asset_info:
             logger.error(f"Asset {symbol} not found in configuration")
@@ -695,62 +1610,52 @@ Trading Strategy:
             }
         
         # Load relevant data
-        transcripts = self._load_transcripts()
-        price_data = self._load_price_data(symbol)
-        
-        # Get current price
-        current_price = price_data.get('current', {}).get('price', 0.0)
-        if not current_price:
-            logger.warning(f"No current price data for {symbol}, using default")
-            current_price = 1000.0  # Default placeholder
+        current_data, current_price = self._current_price_data(symbol)
         
         # Extract relevant content from transcripts
-        relevant_content = self._extract_relevant_transcript_content(transcripts, symbol, asset_info)
+        if relevant_content is None:
+            if transcripts is None:
+                transcripts = self._get_transcripts(current_date)
+            relevant_content = self._extract_relevant_transcript_content(transcripts, symbol, asset_info)
         
         # Create analysis prompt
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        
-        prompt = f"""
-You are a professional financial analyst specialized in {asset_type} markets.
-
-Today's date: {current_date}
-
-Asset to analyze: {symbol} ({asset_info.get('name', '')})
+        prompt = ''.join([
+            _ASSET_PROMPT_HEADER.format(asset_type=asset_type, date=current_date),
+            f"""Asset to analyze: {symbol} ({asset_info.get('name', '')})
 
 Current Price: {current_price}
-24h Change: {price_data.get('current', {}).get('change_24h_percent', 'Unknown')}%
+24h Change: {current_data.get('change_24h_percent', 'Unknown')}%
 
 Asset Description: {asset_info.get('description', '')}
 
-Tags: {', '.join(asset_info.get('tags', []))}
+Tags: {self._asset_tags[symbol]}
 
 You have access to the following information from YouTube financial influencers:
 
-{relevant_content}
+""",
+            relevant_content,
+            _ASSET_PROMPT_FOOTER.format(symbol=symbol),
+        ])
 
-Based on the information above, provide a structured analysis of {symbol} with the following required components:
-1. Overall sentiment (Bullish, Neutral, or Bearish) and confidence level (High, Medium, Low)
-2. Key points from the influencer content
-3. Price forecast for short-term (1-2 weeks) and medium-term (1-3 months)
-4. Clear recommendation (BUY, SELL, or HOLD)
-5. Risk factors to consider
-6. Specific trading strategy with entry/exit points if applicable
-
-Your analysis must be objective and focus only on the information provided.
-"""
-
-        # PHASE 1: Query DeepSeek R1 for structured analysis
-        analysis_data = self._query_deepseek_r1(prompt)
-        
-        if not analysis_data:
-            return {
-                "symbol": symbol,
-                "status": "error",
-                "message": "Failed to generate analysis"
-            }
+        # Ask for the analysis and the trading decision in one request, and
+        # only fall back to the two-phase path if that does not work out
+        combined = self._analyze_and_decide(symbol, prompt) if self.single_call else None
         
-        # PHASE 2: Process analysis with DeepSeek V3 for function calling
-        function_call = self._process_analysis_with_v3(analysis_data, symbol, current_price)
+        if combined:
+            analysis_data, function_call = combined
+        else:
+            # PHASE 1: Query DeepSeek R1 for structured analysis
+            analysis_data = self._query_deepseek_r1(prompt)
+            
+            if not analysis_data:
+                return {
+                    "symbol": symbol,
+                    "status": "error",
+                    "message": "Failed to generate analysis"
+                }
+            
+            # PHASE 2: Process analysis with DeepSeek V3 for function calling
+            function_call = self._process_analysis_with_v3(analysis_data, symbol, current_price) if decide else None
         
         # Combine results
         result = {
@@ -760,17 +1665,173 @@ Your analysis must be objective and focus only on the information provided.
             "date": current_date,
             "current_price": current_price,
             "analysis": analysis_data,
-            "trading_decision": function_call.get("arguments", {}),
+            "trading_decision": None,
             "status": "success"
         }
         
-        self._save_analysis(symbol, result)
+        if function_call is not None:
+            self._finish_analysis(result, function_call)
         return result
     
+    def _current_price_data(self, symbol: str) -> Tuple[Dict[str, Any], float]:
+        """
+        Load the current price data for a symbol.
+        
+        Args:
+            symbol: Asset symbol
+            
+        Returns:
+            Tuple of (current price data, current price); the price falls back
+            to a placeholder when no price data is available
+        """
+        # The prompts only use the current price, so skip the history
+        price_data = self._load_price_data(symbol, include_historical=False)
+        current_data = price_data.get('current') or {}
+        
+        # Get current price
+        current_price = current_data.get('price', 0.0)
+        if not current_price:
+            logger.warning(f"No current price data for {symbol}, using default")
+            current_price = 1000.0  # Default placeholder
+        
+        return current_data, current_price
+    
+    def _analyze_group(self, symbols: List[str], relevant_content: Dict[str, str],
+                       current_date: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze several assets and decide on trades with a single DeepSeek request.
+        
+        Args:
+            symbols: Symbols of configured assets
+            relevant_content: Dictionary of symbol -> extracted transcript content
+            current_date: Date of the run as YYYY-MM-DD
+            
+        Returns:
+            Dictionary of symbol -> saved analysis results, for the assets the
+            response covered completely; the others are left out
+        """
+        assets = {}
+        sections = []
+        for number, symbol in enumerate(symbols, 1):
+            asset_type, asset_info = self._asset_index[symbol]
+            current_data, current_price = self._current_price_data(symbol)
+            assets[symbol] = (asset_type, asset_info, current_price)
+            sections.append(f"""
+{'='*50}
+Asset {number}: {symbol} ({asset_info.get('name', '')})
+Market: {asset_type}
+Current Price: {current_price}
+24h Change: {current_data.get('change_24h_percent', 'Unknown')}%
+Asset Description: {asset_info.get('description', '')}
+Tags: {self._asset_tags[symbol]}
+
+Information from YouTube financial influencers:
+
+{relevant_content.get(symbol, '')}
+""")
+        
+        prompt = f"""
+Today's date: {current_date}
+
+Analyze each of the following {len(symbols)} assets.
+{''.join(sections)}
+{'='*50}
+
+For every asset above, provide a structured analysis and trading decision.
+Your analysis must be objective and focus only on the information provided for that asset.
+"""
+        
+        cache_path = self._llm_cache_path(self.deepseek_r1_model, _GROUP_SYSTEM_PROMPT, prompt)
+        response_data = self._cached_response(cache_path)
+        cached = response_data is not None
+        if cached:
+            logger.info(f"Using cached group analysis for {', '.join(symbols)}")
+        else:
+            try:
+                logger.info(f"Sending group analysis request for {', '.join(symbols)} (length: {len(prompt)} chars)")
+                
+                response = self._create_completion(
+                    model=self.deepseek_r1_model,
+                    messages=[
+                        {"role": "system", "content": _GROUP_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.3,
+                    max_tokens=min(8000, 2000 * len(symbols)),
+                    response_format={"type": "json_object"}
+                )
+                content = response.choices[0].message.content
+                try:
+                    response_data = _loads(content)
+                except json.JSONDecodeError as e:
+                    response_data = _loads(_repair_json(content))
+                    logger.info(f"Repaired malformed JSON in group analysis ({e})")
+            except Exception as e:
+                logger.warning(f"Group analysis request failed for {', '.join(symbols)}: {e}")
+                return {}
+        
+        analyses = response_data.get("analyses") if isinstance(response_data, dict) else None
+        results = {}
+        # Entries that passed validation, as received; only these are cached
+        usable = []
+        for entry in analyses if isinstance(analyses, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            analysis_data = copy.deepcopy(entry)
+            symbol = analysis_data.pop("symbol", None)
+            if symbol not in assets or symbol in results or not analysis_data.get("recommendation"):
+                continue
+            function_args = self._validate_order_args(analysis_data.pop("trading_decision", None))
+            if function_args is None:
+                continue
+            usable.append(entry)
+            
+            asset_type, asset_info, current_price = assets[symbol]
+            results[symbol] = {
+                "symbol": symbol,
+                "name": asset_info.get('name', ''),
+                "type": asset_type,
+                "date": current_date,
+                "current_price": current_price,
+                "analysis": analysis_data,
+                "trading_decision": None,
+                "status": "success"
+            }
+            self._finish_analysis(results[symbol], {
+                "function": "place_market_order",
+                "arguments": function_args,
+                "model_response": "Trading decision returned with the group analysis"
+            })
+        
+        # A response without usable entries is not cached, so the next run
+        # asks again instead of falling back to per-asset requests until the
+        # cache entry expires
+        if usable and not cached:
+            self._cache_response(cache_path, {"analyses": usable})
+        
+        missing = [symbol for symbol in symbols if symbol not in results]
+        if missing:
+            logger.warning(f"Group analysis did not cover {', '.join(missing)}")
+        return results
+    
+    def _finish_analysis(self, result: Dict[str, Any], function_call: Dict[str, Any]) -> None:
+        """
+        Add the trading decision to an analysis result and save it.
+        
+        Args:
+            result: Analysis result from _analyze_asset
+            function_call: Function call result with trading decision
+        """
+        result["trading_decision"] = function_call.get("arguments", {})
+        self._save_analysis(result["symbol"], result)
+    
     def _save_analysis(self, symbol: str, analysis: Dict[str, Any]) -> bool:
         """
         Save analysis results to storage.
         
+        The payload is written to a temporary file in one call and renamed
+        into place, so readers never see a partially written analysis.
+        
         Args:
             symbol: Asset symbol
             analysis: Analysis data to save
@@ -779,11 +1840,10 @@ Your analysis must be objective and focus only on the information provided.
             True if saved successfully, False otherwise
         """
         try:
-            date_str = datetime.now().strftime("%Y-%m-%d")
+            # Name the file after the run date recorded in the analysis
+            date_str = analysis.get("date") or _current_date()
             file_path = os.path.join(self.output_path, f"{symbol}_analysis_{date_str}.json")
-            
-            with open(file_path, 'w') as file:
-                json.dump(analysis, file, indent=2)
+            _write_atomic(file_path, _dump_json(analysis, pretty=self.pretty_json))
             
             logger.info(f"Saved analysis for {symbol}")
             return True
@@ -791,26 +1851,86 @@ Your analysis must be objective and focus only on the information provided.
             logger.error(f"Error saving analysis for {symbol}: {e}")
             return False
     
-    def analyze_all_crypto(self) -> Dict[str, Dict[str, Any]]:
+    def analyze_assets(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
         """
-        Analyze all cryptocurrencies in the assets config.
+        Analyze several assets concurrently.
         
+        Args:
+            symbols: Symbols of assets in the assets config
+            
         Returns:
-            Dictionary of symbol -> analysis results
+            Dictionary of symbol -> analysis results, in the order given
         """
-        results = {}
+        if not symbols:
+            return {}
         
-        crypto_assets = self.assets.get('crypto', [])
-        for asset in crypto_assets:
-            symbol = asset.get('symbol')
-            if not symbol:
-                continue
-                
-            analysis = self.analyze_asset(symbol)
-            results[symbol] = analysis
+        # Once per run rather than on each lookup, which only sees its own key
+        self._prune_llm_cache()
+        
+        configured = {symbol: self._asset_index[symbol][1] for symbol in symbols if symbol in self._asset_index}
+        
+        # Date the whole batch once
+        current_date = _current_date()
+        
+        # Every asset is matched against the same transcripts, so load them
+        # once and extract the content for all assets in a single pass
+        relevant_content = self._extract_relevant_content_batch(self._get_transcripts(current_date), configured)
+        
+        # Each analysis waits on DeepSeek API round trips, so run them
+        # concurrently; _create_completion caps the calls in flight
+        max_workers = max(1, min(self.max_concurrent_requests, len(symbols)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = {}
+            
+            # Analyze several assets per request when configured; assets a
+            # group response does not cover are analyzed one by one below
+            if self.assets_per_request > 1 and self.client:
+                grouped = list(configured)
+                groups = [
+                    grouped[i:i + self.assets_per_request]
+                    for i in range(0, len(grouped), self.assets_per_request)
+                    if len(grouped) - i > 1
+                ]
+                analyze_group = lambda group: self._analyze_group(group, relevant_content, current_date)
+                for group_results in executor.map(analyze_group, groups):
+                    results.update(group_results)
+            
+            remaining = [symbol for symbol in symbols if symbol not in results]
+            results.update(zip(remaining, executor.map(
+                lambda symbol: self._analyze_asset(
+                    symbol, None, relevant_content.get(symbol), decide=False, current_date=current_date
+                ),
+                remaining
+            )))
+            results = {symbol: results[symbol] for symbol in symbols}
             
+            # Decide on all analyses that came without a decision in one V3 request
+            pending = {
+                symbol: result for symbol, result in results.items()
+                if result.get("status") == "success" and result["trading_decision"] is None
+            }
+            if pending:
+                decisions = self._process_analyses_with_v3({
+                    symbol: (result["analysis"], result["current_price"]) for symbol, result in pending.items()
+                })
+                # Save the analyses in parallel rather than one file after another
+                list(executor.map(
+                    lambda symbol: self._finish_analysis(pending[symbol], decisions[symbol]),
+                    pending
+                ))
+        
         return results
     
+    def analyze_all_crypto(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze all cryptocurrencies in the assets config.
+        
+        Returns:
+            Dictionary of symbol -> analysis results
+        """
+        symbols = [asset['symbol'] for asset in self.assets.get('crypto', []) if asset.get('symbol')]
+        return self.analyze_assets(list(dict.fromkeys(symbols)))
+    
     def get_latest_recommendation(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
         Get the most recent analysis for a symbol.
@@ -821,28 +1941,49 @@ Your analysis must be objective and focus only on the information provided.
         Returns:
             Latest analysis data or None if not found
         """
-        analysis_files = [f for f in os.listdir(self.output_path) 
-                         if f.startswith(f"{symbol}_analysis_") and f.endswith('.json')]
-        
-        if not analysis_files:
+        latest_file = self._latest_files(self.output_path, ("analysis",)).get((symbol, "analysis"))
+        if not latest_file:
             return None
-            
-        # Get the most recent file based on filename date
-        latest_file = sorted(analysis_files, reverse=True)[0]
         
         try:
-            with open(os.path.join(self.output_path, latest_file), 'r') as file:
-                return json.load(file)
+            return _read_json(latest_file)
         except Exception as e:
             logger.error(f"Error loading analysis for {symbol}: {e}")
             return None
     
-    def extract_trade_signals(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    def get_latest_recommendations(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the most recent analysis for several symbols.
+        
+        The analysis directory index is looked up for all symbols at once.
+        
+        Args:
+            symbols: Asset symbols
+            
+        Returns:
+            Dictionary of symbol -> latest analysis data, for symbols that have one
+        """
+        latest_files = self._latest_files(self.output_path, ("analysis",))
+        
+        results = {}
+        for symbol in symbols:
+            latest_file = latest_files.get((symbol, "analysis"))
+            if not latest_file:
+                continue
+            try:
+                results[symbol] = _read_json(latest_file)
+            except Exception as e:
+                logger.error(f"Error loading analysis for {symbol}: {e}")
+        
+        return results
+    
+    def extract_trade_signals(self, analysis: Dict[str, Any], current_date: str = None) -> Dict[str, Any]:
         """
         Extract actionable trade signals from an analysis.
         
         Args:
             analysis: Analysis data dictionary
+            current_date: Signal date as YYYY-MM-DD (default: today)
             
         Returns:
             Dictionary with trade signal information
@@ -850,6 +1991,8 @@ Your analysis must be objective and focus only on the information provided.
         if analysis.get('status') != 'success':
             return {"action": "NONE", "reason": "Analysis failed"}
         
+        current_date = current_date or _current_date()
+        
         # First try to use the trading_decision if available (from V3 function call)
         if 'trading_decision' in analysis and analysis['trading_decision']:
             trading_decision = analysis['trading_decision']
@@ -861,7 +2004,7 @@ Your analysis must be objective and focus only on the information provided.
                 "confidence": trading_decision.get('confidence', 'LOW').upper(),
                 "allocation_percentage": trading_decision.get('allocation_percentage', 0),
                 "reason": trading_decision.get('reason', ''),
-                "date": datetime.now().strftime("%Y-%m-%d"),
+                "date": current_date,
                 "analysis_id": analysis.get('date', '')
             }
             
@@ -876,29 +2019,30 @@ Your analysis must be objective and focus only on the information provided.
         if not recommendation:
             # Extract from analysis_text if structured data not available
             analysis_text = analysis_data.get('analysis_text', '')
+            tokens = set(_SIGNAL_TOKEN_RE.findall(analysis_text))
             
             # Extract recommendation
-            if "BUY" in analysis_text:
+            if "BUY" in tokens:
                 recommendation = "BUY"
-            elif "SELL" in analysis_text:
+            elif "SELL" in tokens:
                 recommendation = "SELL"
-            elif "HOLD" in analysis_text or "ACCUMULATE" in analysis_text:
+            elif "HOLD" in tokens or "ACCUMULATE" in tokens:
                 recommendation = "HOLD"
             else:
                 recommendation = "NONE"
                 
             # Extract sentiment
-            if "Bullish" in analysis_text:
+            if "Bullish" in tokens:
                 sentiment = "BULLISH"
-            elif "Bearish" in analysis_text:
+            elif "Bearish" in tokens:
                 sentiment = "BEARISH"
             else:
                 sentiment = "NEUTRAL"
                 
             # Extract confidence
-            if "Confidence: High" in analysis_text:
+            if "Confidence: High" in tokens:
                 confidence = "HIGH"
-            elif "Confidence: Medium" in analysis_text:
+            elif "Confidence: Medium" in tokens:
                 confidence = "MEDIUM"
             else:
                 confidence = "LOW"
@@ -919,10 +2063,25 @@ Your analysis must be objective and focus only on the information provided.
             "sentiment": sentiment,
             "confidence": confidence,
             "allocation_percentage": allocation_percentage,
-            "date": datetime.now().strftime("%Y-%m-%d"),
+            "date": current_date,
             "analysis_id": analysis.get('date', '')
         }
 
+    def extract_trade_signals_batch(self, analyses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Extract trade signals from several analyses at once.
+        
+        Args:
+            analyses: List of analysis data dictionaries
+            
+        Returns:
+            List of trade signals in the same order as the input analyses
+        """
+        # Date all signals of the batch once
+        current_date = _current_date()
+        extract = self.extract_trade_signals
+        return [extract(analysis, current_date) for analysis in analyses]
+
 # Example usage
 if __name__ == "__main__":
     # This is for testing the module directly
@@ -7,17 +7,41 @@ This module provides a centralized manager for all external API clients.
 import os
 import time
 import logging
+import threading
 from typing import Dict, Any, Optional
 import yaml
 import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Import custom utility modules
-from modules.utils.logging import get_logger
-from modules.utils.exceptions import APIConnectionError, APIRateLimitError, APIError
+from modules.utility.custom_exceptions import APIConnectionError, APIRateLimitError, APIError
+
+logger = logging.getLogger('api_client_manager')
 
-logger = get_logger('api_client_manager')
+# Retry policies, shared by all sessions; urllib3 never mutates a Retry in
+# place, it derives a new one for each attempt
+_CLIENT_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(["GET", "POST"])
+)
+_REQUEST_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=[500, 502, 503, 504],
+    allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"])
+)
+
+# Connections kept open per host, enough for concurrent callers to share a session
+POOL_MAXSIZE = 32
 
 class APIClientManager:
     """Manages connections to external APIs."""
@@ -36,13 +60,16 @@ class APIClientManager:
         
         # Initialize clients
         self.clients = {}
+        
+        # Service name -> credentials, see _creds
+        self._creds_cache: Dict[str, Dict[str, Any]] = {}
         self.session = self._create_session()
     
     def _load_config(self) -> Dict[str, Any]:
         """Load API configuration from file."""
         try:
-            with open(self.config_path, 'r') as file:
-                return yaml.safe_load(file) or {}
+            with open(self.config_path, 'rb') as file:
+                return yaml.load(file, Loader=_YamlLoader) or {}
         except Exception as e:
             logger.error(f"Failed to load API config: {e}")
             return {}
@@ -51,21 +78,51 @@ class APIClientManager:
         """Create a session with retry logic."""
         session = requests.Session()
         
-        # Configure retry strategy
-        retries = Retry(
-            total=3,
-            backoff_factor=0.3,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST"]
-        )
-        
         # Add retry adapter to session
-        adapter = HTTPAdapter(max_retries=retries)
+        adapter = HTTPAdapter(max_retries=_CLIENT_RETRY, pool_maxsize=POOL_MAXSIZE)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
         return session
     
+    def request(self, url, method="GET", params=None, data=None, headers=None, auth=None,
+                timeout=30, rate_limiter=None, endpoint_id=None):
+        """
+        Make an API request over this manager's session, see api_request.
+        """
+        return api_request(url, method=method, params=params, data=data, headers=headers, auth=auth,
+                           timeout=timeout, rate_limiter=rate_limiter, endpoint_id=endpoint_id,
+                           session=self.session)
+    
+    def _creds(self, name: str) -> Dict[str, Any]:
+        """
+        Get the credentials for a service, asking the secrets manager only once.
+        
+        Args:
+            name: Service name as known to the secrets manager
+            
+        Returns:
+            Dictionary of credentials, empty without a secrets manager
+        """
+        if name not in self._creds_cache:
+            self._creds_cache[name] = self.secrets_manager.get_api_keys(name) if self.secrets_manager else {}
+        return self._creds_cache[name]
+    
+    def invalidate_credentials(self, name: str = None):
+        """
+        Forget cached credentials, e.g. after rotating secrets.
+        
+        Clients that were already created keep using the old credentials
+        until close_all_clients is called.
+        
+        Args:
+            name: Service name, or None to forget all credentials
+        """
+        if name is None:
+            self._creds_cache.clear()
+        else:
+            self._creds_cache.pop(name, None)
+    
     def get_kucoin_client(self, test_mode: bool = False):
         """
         Get KuCoin API client.
@@ -83,9 +140,7 @@ class APIClientManager:
             return self.clients[client_key]
         
         # Get credentials from secrets manager
-        credentials = {}
-        if self.secrets_manager:
-            credentials = self.secrets_manager.get_api_keys('kucoin')
+        credentials = self._creds('kucoin')
         
         # Get settings from config
         settings = self.config.get('apis', {}).get('kucoin', {})
@@ -162,9 +217,7 @@ class APIClientManager:
             return self.clients[client_key]
         
         # Get credentials from secrets manager
-        credentials = {}
-        if self.secrets_manager:
-            credentials = self.secrets_manager.get_api_keys('youtube_api')
+        credentials = self._creds('youtube_api')
         
         try:
             # Try to import required packages
@@ -199,27 +252,24 @@ class APIClientManager:
         """
         Get DeepSeek API client.
         
+        The client comes from modules.utility.deepseek_utility and is shared
+        with every other component using the same key, so it is not closed
+        by close_all_clients.
+        
         Args:
-            is_analysis: Whether for analysis (Reasoner) or execution (Chat)
+            is_analysis: Whether for analysis (Reasoner) or execution (Chat);
+                both share one client and its connection pool
             
         Returns:
             DeepSeek OpenAI-compatible client
         """
-        client_key = f"deepseek_{'analysis' if is_analysis else 'execution'}"
-        
-        # Return existing client if already initialized
-        if client_key in self.clients:
-            return self.clients[client_key]
-        
         # Get credentials from secrets manager
-        credentials = {}
-        if self.secrets_manager:
-            credentials = self.secrets_manager.get_api_keys('deepseek')
+        credentials = self._creds('deepseek')
         
         try:
             # Try to import required packages
             try:
-                from openai import OpenAI
+                from modules.utility.deepseek_utility import get_deepseek_client
                 
                 # Get API key
                 api_key = credentials.get('api_key', '')
@@ -228,17 +278,8 @@ class APIClientManager:
                     logger.error("DeepSeek API key not found")
                     return None
                 
-                # Create client
-                client = OpenAI(
-                    api_key=api_key,
-                    base_url="https://api.deepseek.com"
-                )
-                
-                # Store client
-                self.clients[client_key] = client
-                logger.info(f"DeepSeek client initialized for {'analysis' if is_analysis else 'execution'}")
-                
-                return client
+                max_connections = self.config.get('apis', {}).get('deepseek', {}).get('max_concurrent_requests', 8)
+                return get_deepseek_client(api_key, max(1, max_connections))
                 
             except ImportError:
                 logger.error("OpenAI client not available. Install with: pip install openai")
@@ -270,18 +311,28 @@ class APIClientManager:
 
 
 class APIRateLimiter:
-    """Handles rate limiting for API calls."""
+    """
+    Handles rate limiting for API calls.
+    
+    Each endpoint gets a token bucket that refills at calls_per_minute and
+    holds up to burst tokens, so calls go out immediately while tokens are
+    left and are only spaced out once the bucket is empty.
+    """
     
-    def __init__(self, calls_per_minute: int = 60):
+    def __init__(self, calls_per_minute: int = 60, burst: Optional[int] = None):
         """
         Initialize the APIRateLimiter.
         
         Args:
             calls_per_minute: Maximum calls allowed per minute
+            burst: Maximum calls allowed back to back, defaults to a tenth of
+                calls_per_minute (at least 1)
         """
         self.calls_per_minute = calls_per_minute
-        self.interval = 60.0 / calls_per_minute  # Seconds per call
-        self.last_call_time = {}  # endpoint -> timestamp
+        self.rate = calls_per_minute / 60.0  # Tokens per second
+        self.burst = burst or max(1, calls_per_minute // 10)
+        self._buckets = {}  # endpoint -> (tokens, last refill time)
+        self._lock = threading.Lock()
     
     def wait_if_needed(self, endpoint: str):
         """
@@ -290,21 +341,48 @@ class APIRateLimiter:
         Args:
             endpoint: API endpoint identifier
         """
-        now = time.time()
-        
-        if endpoint in self.last_call_time:
-            elapsed = now - self.last_call_time[endpoint]
-            if elapsed < self.interval:
-                wait_time = self.interval - elapsed
-                logger.debug(f"Rate limiting {endpoint}: waiting {wait_time:.2f}s")
-                time.sleep(wait_time)
-        
-        # Update last call time
-        self.last_call_time[endpoint] = time.time()
+        with self._lock:
+            now = time.monotonic()
+            tokens, last_refill = self._buckets.get(endpoint, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last_refill) * self.rate)
+            
+            # Take the token now, possibly going into debt, so concurrent
+            # callers queue up behind each other instead of racing for it
+            tokens -= 1
+            self._buckets[endpoint] = (tokens, now)
+        
+        if tokens < 0:
+            wait_time = -tokens / self.rate
+            logger.debug(f"Rate limiting {endpoint}: waiting {wait_time:.2f}s")
+            time.sleep(wait_time)
+
+
+# Session shared by api_request calls, created on first use
+_default_session = None
+_default_session_lock = threading.Lock()
+
+
+def _get_default_session() -> requests.Session:
+    """
+    Get the session shared by api_request calls.
+    
+    Keeping one session keeps its connections alive between requests instead
+    of opening a new TCP/TLS connection for every call.
+    
+    Returns:
+        Session with retry logic
+    """
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(max_retries=_REQUEST_RETRY, pool_maxsize=POOL_MAXSIZE))
+            _default_session = session
+        return _default_session
 
 
 def api_request(url, method="GET", params=None, data=None, headers=None, auth=None, 
-              timeout=30, rate_limiter=None, endpoint_id=None):
+              timeout=30, rate_limiter=None, endpoint_id=None, session=None):
     """
     Make an API request with error handling and rate limiting.
     
@@ -318,6 +396,8 @@ def api_request(url, method="GET", params=None, data=None, headers=None, auth=No
         timeout: Request timeout
         rate_limiter: Optional APIRateLimiter instance
         endpoint_id: Endpoint identifier for rate limiting
+        session: Session to send the request with, defaults to a shared
+            session with retry logic
         
     Returns:
         Response data
@@ -331,15 +411,8 @@ def api_request(url, method="GET", params=None, data=None, headers=None, auth=No
     if rate_limiter and endpoint_id:
         rate_limiter.wait_if_needed(endpoint_id)
     
-    # Create session with retry logic
-    session = requests.Session()
-    retries = Retry(
-        total=3,
-        backoff_factor=0.3,
-        status_forcelist=[500, 502, 503, 504],
-        allowed_methods=["GET", "POST", "PUT", "DELETE"]
-    )
-    session.mount("https://", HTTPAdapter(max_retries=retries))
+    if session is None:
+        session = _get_default_session()
     
     try:
         # Make request
@@ -377,6 +450,4 @@ def api_request(url, method="GET", params=None, data=None, headers=None, auth=No
         elif "timeout" in str(e).lower():
             raise APIConnectionError(f"Connection timeout: {e}")
         else:
-            raise APIConnectionError(f"Connection error: {e}")
-    finally:
-        session.close()
\ No newline at end of file
+            raise APIConnectionError(f"Connection error: {e}")
\ No newline at end of file
@@ -6,13 +6,15 @@ It handles order creation, validation, and submission to exchanges.
 """
 
 import os
+import copy
 import json
 import logging
-import yaml
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple
 import time
 
+from modules.utility.config_utility import index_assets, load_yaml
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,6 +22,60 @@ logging.basicConfig(
 )
 logger = logging.getLogger('order_manager')
 
+# For simplicity, assume we have a fixed amount of USD for each order
+# In a real implementation, this would come from portfolio calculations
+BASE_ORDER_AMOUNT = 1000.0  # Dummy value in USD
+
+# Share of the maximum allocation used for each signal confidence level
+CONFIDENCE_ALLOCATION_FACTORS = {"HIGH": 1.0, "MEDIUM": 0.6}
+LOW_CONFIDENCE_ALLOCATION_FACTOR = 0.3
+
+def _utc_timestamp() -> str:
+    """Current time as an ISO 8601 UTC timestamp, the format of all order records."""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+def _timestamp_epoch(timestamp: Any) -> Optional[float]:
+    """
+    Convert an order record timestamp to seconds since the epoch.
+    
+    Records written before timestamps were stored in UTC carry naive local
+    times, which are read as local time.
+    
+    Args:
+        timestamp: ISO 8601 timestamp
+        
+    Returns:
+        Seconds since the epoch, or None if the timestamp can't be parsed
+    """
+    try:
+        return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+def _compute_order_decisions(actions: List[str], confidences: List[str], max_allocation: float,
+                             base_amount: float = BASE_ORDER_AMOUNT) -> Tuple[List[str], List[float]]:
+    """
+    Compute order sides and USD amounts for a batch of actionable trade signals.
+    
+    Args:
+        actions: Signal actions (BUY or SELL)
+        confidences: Signal confidence levels (HIGH, MEDIUM or LOW)
+        max_allocation: Maximum allocation per asset (0.0 to 1.0)
+        base_amount: USD amount the allocation is applied to
+        
+    Returns:
+        Tuple of (sides, amounts) in input order
+    """
+    factors = CONFIDENCE_ALLOCATION_FACTORS
+    
+    # Higher confidence = higher allocation
+    sides = ["buy" if action == "BUY" else "sell" for action in actions]
+    amounts = [
+        base_amount * (max_allocation * factors.get(confidence, LOW_CONFIDENCE_ALLOCATION_FACTOR))
+        for confidence in confidences
+    ]
+    return sides, amounts
+
 class OrderManager:
     """Manages trading orders based on analysis recommendations."""
         
@@ -51,6 +107,13 @@ class OrderManager:
         self.config = self._load_yaml(config_path)
         self.assets = self._load_yaml(assets_path)
         
+        # Symbol -> asset info (with its category as 'type'); the first
+        # category listing a symbol wins, crypto before stocks
+        self._asset_index = {
+            symbol: {**asset, 'type': asset_category}
+            for symbol, (asset_category, asset) in index_assets(self.assets).items()
+        }
+        
         # Create output directory if it doesn't exist
         os.makedirs(self.output_path, exist_ok=True)
         
@@ -65,20 +128,23 @@ class OrderManager:
         self.max_allocation = self.config.get('system', {}).get('max_allocation_per_asset', 0.20)
     
     def _load_yaml(self, file_path: str) -> Dict[str, Any]:
-        """Load YAML configuration file."""
+        """
+        Load YAML configuration file.
+        
+        Files are read through the process-wide config cache, whose dicts
+        are shared, so they are copied before secrets are merged in.
+        """
         try:
-            with open(file_path, 'r') as file:
-                config = yaml.safe_load(file) or {}
+            config = copy.deepcopy(load_yaml(file_path) or {})
                 
             # Also try to load secrets file if it exists
             secrets_path = os.path.join(os.path.dirname(file_path), "secrets.yaml")
             if os.path.exists(secrets_path):
                 try:
-                    with open(secrets_path, 'r') as secret_file:
-                        secrets = yaml.safe_load(secret_file) or {}
+                    secrets = load_yaml(secrets_path, use_snapshot=False) or {}
                         
                     # Merge secrets into config (deep merge)
-                    self._merge_dicts(config, secrets)
+                    self._merge_dicts(config, copy.deepcopy(secrets))
                 except Exception as e:
                     logger.error(f"Failed to load secrets from {secrets_path}: {e}")
                     
@@ -107,13 +173,7 @@ class OrderManager:
         Returns:
             Asset information dictionary or None if not found
         """
-        for asset_category in ['crypto', 'stocks']:
-            for asset in self.assets.get(asset_category, []):
-                if asset.get('symbol') == symbol:
-                    asset_info = asset.copy()
-                    asset_info['type'] = asset_category
-                    return asset_info
-        return None
+        return self._asset_index.get(symbol)
     
     def _validate_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -192,7 +252,7 @@ class OrderManager:
         Returns:
             Dictionary with order result
         """
-        logger.info(f"Placing KuCoin order: {order['side']} {order['amount']} {order['symbol']}")
+        logger.info("Placing KuCoin order: %s %s %s", order['side'], order['amount'], order['symbol'])
         
         # Check if we're in test mode
         if hasattr(self, 'test_mode') and self.test_mode:
@@ -219,7 +279,7 @@ class OrderManager:
             
             # Create client with requests_params
             client = Client(api_key, api_secret, api_passphrase, sandbox_mode, requests_params)
-            logger.info(f"KuCoin client initialized for real trading (sandbox: {sandbox_mode})")
+            logger.info("KuCoin client initialized for real trading (sandbox: %s)", sandbox_mode)
             
             # Format the symbol for KuCoin (add -USDT if not specified)
             kucoin_symbol = order['symbol'] if '-' in order['symbol'] else f"{order['symbol']}-USDT"
@@ -233,7 +293,7 @@ class OrderManager:
                         Client.SIDE_BUY,
                         funds=str(order['amount'])
                     )
-                    logger.info(f"Placed market buy order with funds: {order['amount']} USDT")
+                    logger.info("Placed market buy order with funds: %s USDT", order['amount'])
                 else:
                     # For sell orders, convert the USD amount to crypto amount
                     # In a real implementation, you would get the current price and calculate the size
@@ -250,7 +310,7 @@ class OrderManager:
                         Client.SIDE_SELL,
                         size=str(size)
                     )
-                    logger.info(f"Placed market sell order with size: {size} {order['symbol']}")
+                    logger.info("Placed market sell order with size: %s %s", size, order['symbol'])
             
             elif order['type'] == 'limit':
                 if 'price' not in order:
@@ -266,7 +326,7 @@ class OrderManager:
                     str(order['price']),
                     str(size)
                 )
-                logger.info(f"Placed limit {order['side']} order: {size} {order['symbol']} @ {order['price']}")
+                logger.info("Placed limit %s order: %s %s @ %s", order['side'], size, order['symbol'], order['price'])
             
             else:
                 raise ValueError(f"Unsupported order type: {order['type']}")
@@ -281,15 +341,15 @@ class OrderManager:
                 "price": order.get('price', 'market'),
                 "status": "success",
                 "exchange": "kucoin",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _utc_timestamp(),
                 "raw_data": response
             }
             
-            logger.info(f"Order placed successfully with ID: {result['order_id']}")
+            logger.info("Order placed successfully with ID: %s", result['order_id'])
             return result
             
         except Exception as e:
-            logger.error(f"Error placing KuCoin order: {e}")
+            logger.error("Error placing KuCoin order: %s", e)
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
             
@@ -307,7 +367,7 @@ class OrderManager:
         Returns:
             Dictionary with simulated order result
         """
-        logger.info(f"Creating dummy KuCoin order: {order['side']} {order['amount']} {order['symbol']}")
+        logger.info("Creating dummy KuCoin order: %s %s %s", order['side'], order['amount'], order['symbol'])
         
         # Simulate API latency
         time.sleep(1)
@@ -325,7 +385,7 @@ class OrderManager:
             "amount": order['amount'],
             "status": "success",
             "exchange": "kucoin",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _utc_timestamp()
         }
 
     def _get_current_price(self, symbol: str) -> Dict[str, Any]:
@@ -368,62 +428,91 @@ class OrderManager:
             logger.error(f"Error getting current price for {symbol}: {e}")
             return None
     
-    def create_order_from_signal(self, signal: Dict[str, Any], 
-                               allocation: float = None) -> Optional[Dict[str, Any]]:
+    def _is_actionable_signal(self, signal: Dict[str, Any]) -> bool:
         """
-        Create an order from a trade signal.
+        Check whether a trade signal needs an order for a configured asset.
         
         Args:
             signal: Trade signal from analysis engine
-            allocation: Percentage of portfolio to allocate (0.0 to 1.0)
             
         Returns:
-            Order data or None if no action required
+            True if an order should be created for the signal
         """
         symbol = signal.get('symbol')
         action = signal.get('action')
         
         if not symbol or action == "NONE" or action == "HOLD":
             logger.info(f"No order needed for {symbol} (action: {action})")
-            return None
+            return False
         
         # Get asset info
-        asset_info = self._get_asset_info(symbol)
-        if not asset_info:
+        if not self._get_asset_info(symbol):
             logger.error(f"Asset not found: {symbol}")
-            return None
+            return False
         
-        # Determine order side
-        side = "buy" if action == "BUY" else "sell"
-        
-        # Set default allocation if not provided
-        if allocation is None:
-            # Higher confidence = higher allocation
-            confidence = signal.get('confidence', 'LOW')
-            if confidence == "HIGH":
-                allocation = self.max_allocation
-            elif confidence == "MEDIUM":
-                allocation = self.max_allocation * 0.6
-            else:  # LOW
-                allocation = self.max_allocation * 0.3
-        
-        # For simplicity, assume we have a fixed amount of USD for each order
-        # In a real implementation, this would come from portfolio calculations
-        base_amount = 1000.0  # Dummy value in USD
-        amount = base_amount * allocation
-        
-        # Create order
-        order = {
-            "symbol": symbol,
+        return True
+    
+    def _build_order(self, signal: Dict[str, Any], side: str, amount: float,
+                     timestamp: str = None) -> Dict[str, Any]:
+        """Build the order dictionary for a trade signal."""
+        return {
+            "symbol": signal.get('symbol'),
             "type": "market",  # Use market order for simplicity
             "side": side,
             "amount": amount,
-            "reason": f"Signal {action} with {signal.get('confidence', 'LOW')} confidence",
+            "reason": f"Signal {signal.get('action')} with {signal.get('confidence', 'LOW')} confidence",
             "analysis_id": signal.get('analysis_id'),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp or _utc_timestamp()
         }
+    
+    def create_order_from_signal(self, signal: Dict[str, Any], 
+                               allocation: float = None,
+                               timestamp: str = None) -> Optional[Dict[str, Any]]:
+        """
+        Create an order from a trade signal.
+        
+        Args:
+            signal: Trade signal from analysis engine
+            allocation: Percentage of portfolio to allocate (0.0 to 1.0)
+            timestamp: Order timestamp in ISO format (default: now, UTC)
+            
+        Returns:
+            Order data or None if no action required
+        """
+        if not self._is_actionable_signal(signal):
+            return None
+        
+        sides, amounts = _compute_order_decisions(
+            [signal.get('action')], [signal.get('confidence', 'LOW')], self.max_allocation
+        )
+        amount = amounts[0] if allocation is None else BASE_ORDER_AMOUNT * allocation
+        
+        return self._build_order(signal, sides[0], amount, timestamp)
+    
+    def create_orders_from_signals(self, signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create orders from several trade signals at once.
         
-        return order
+        Args:
+            signals: Trade signals from the analysis engine
+            
+        Returns:
+            List of orders for the signals that require one, in input order
+        """
+        # All orders in a batch share one timestamp
+        timestamp = _utc_timestamp()
+        
+        actionable = [signal for signal in signals if self._is_actionable_signal(signal)]
+        sides, amounts = _compute_order_decisions(
+            [signal.get('action') for signal in actionable],
+            [signal.get('confidence', 'LOW') for signal in actionable],
+            self.max_allocation
+        )
+        
+        return [
+            self._build_order(signal, side, amount, timestamp)
+            for signal, side, amount in zip(actionable, sides, amounts)
+        ]
     
     def submit_order(self, order: Dict[str, Any], 
                    confirm: bool = None) -> Dict[str, Any]:
@@ -524,7 +613,7 @@ class OrderManager:
                     "order_id": order_id,
                     "cancelled_ids": cancellation.get('cancelledOrderIds', []),
                     "exchange": exchange,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _utc_timestamp()
                 }
             else:
                 return {
@@ -543,7 +632,7 @@ class OrderManager:
                 "status": "error",
                 "reason": str(e),
                 "order_id": order_id,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _utc_timestamp()
             }
 
     def cancel_all_orders(self, symbol: str = None) -> Dict[str, Any]:
@@ -582,7 +671,7 @@ class OrderManager:
                 "symbol": symbol,
                 "cancelled_ids": cancellation.get('cancelledOrderIds', []),
                 "exchange": "kucoin",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _utc_timestamp()
             }
             
             # Save cancellation result
@@ -596,7 +685,7 @@ class OrderManager:
                 "status": "error",
                 "reason": str(e),
                 "symbol": symbol,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _utc_timestamp()
             }
 
     def _find_order(self, order_id: str) -> Optional[Dict[str, Any]]:
@@ -643,10 +732,10 @@ class OrderManager:
             with open(file_path, 'w') as file:
                 json.dump(order, file, indent=2)
             
-            logger.info(f"Saved order {order_id}")
+            logger.info("Saved order %s", order_id)
             return True
         except Exception as e:
-            logger.error(f"Error saving order: {e}")
+            logger.error("Error saving order: %s", e)
             return False
     
     def get_order_history(self, days_back: int = 30) -> List[Dict[str, Any]]:
@@ -668,21 +757,20 @@ class OrderManager:
                     with open(os.path.join(self.output_path, filename), 'r') as file:
                         order = json.load(file)
                         
-                        # Parse timestamp and filter by age
-                        try:
-                            timestamp = datetime.fromisoformat(order['timestamp'].replace('Z', '+00:00'))
-                            if timestamp.timestamp() >= cutoff_date:
-                                orders.append(order)
-                        except (KeyError, ValueError):
-                            # If we can't parse the timestamp, include it anyway
-                            orders.append(order)
+                        # Parse timestamp and filter by age; if we can't
+                        # parse the timestamp, include the order anyway
+                        epoch = _timestamp_epoch(order.get('timestamp'))
+                        if epoch is None or epoch >= cutoff_date:
+                            orders.append((epoch, order))
                             
                 except Exception as e:
                     logger.error(f"Error loading order {filename}: {e}")
         
-        # Sort by timestamp, newest first
-        orders.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-        return orders
+        # Sort by timestamp, newest first, comparing instants rather than
+        # strings so UTC and older local timestamps interleave correctly;
+        # orders without a usable timestamp go last
+        orders.sort(key=lambda entry: float('-inf') if entry[0] is None else entry[0], reverse=True)
+        return [order for _, order in orders]
 
 
 # Example usage
@@ -12,6 +12,12 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional
 import yaml
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -56,8 +62,8 @@ class Portfolio:
     def _load_yaml(self, file_path: str) -> Dict[str, Any]:
         """Load YAML configuration file."""
         try:
-            with open(file_path, 'r') as file:
-                return yaml.safe_load(file) or {}
+            with open(file_path, 'rb') as file:
+                return yaml.load(file, Loader=_YamlLoader) or {}
         except Exception as e:
             logger.error(f"Failed to load {file_path}: {e}")
             return {}
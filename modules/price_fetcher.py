@@ -13,6 +13,8 @@ from typing import Dict, List, Any, Optional
 import yaml
 import traceback
 
+from modules.utility.config_utility import load_yaml
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -70,7 +72,7 @@ class PriceFetcher:
                 self.logger.warning(f"Secrets file not found: {secrets_path}")
                 secrets = {}
             else:
-                secrets = self._load_config(secrets_path)
+                secrets = self._load_config(secrets_path, use_snapshot=False)
                 if not secrets:
                     self.logger.warning("Empty or invalid secrets.yaml")
             
@@ -120,15 +122,23 @@ class PriceFetcher:
             self.logger.debug(traceback.format_exc())
             self.client = DummyKuCoinClient()
     
-    def _load_config(self, file_path: str) -> Dict[str, Any]:
-        """Load YAML configuration file with improved error handling."""
+    def _load_config(self, file_path: str, use_snapshot: bool = True) -> Dict[str, Any]:
+        """
+        Load YAML configuration file with improved error handling.
+        
+        Files are read through the process-wide config cache, so the returned
+        dict is shared with other components and must not be mutated.
+        
+        Args:
+            file_path: Path to the YAML file
+            use_snapshot: Whether the parsed file may be snapshotted to JSON
+        """
         try:
-            with open(file_path, 'r') as file:
-                config = yaml.safe_load(file)
-                if config is None:
-                    self.logger.error(f"Config file {file_path} was loaded but is empty or invalid")
-                    return {}
-                return config
+            config = load_yaml(file_path, use_snapshot=use_snapshot)
+            if config is None:
+                self.logger.error(f"Config file {file_path} was loaded but is empty or invalid")
+                return {}
+            return config
         except FileNotFoundError:
             self.logger.error(f"Config file not found: {file_path}")
             return {}
@@ -8,13 +8,14 @@ of financial content creators defined in the configuration file.
 import os
 import json
 import logging
-import yaml
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from youtube_transcript_api import YouTubeTranscriptApi
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from modules.utility.config_utility import load_yaml
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -52,26 +53,24 @@ class TranscriptFetcher:
 
         # Load settings.yaml first
         try:
-            with open(settings_path, 'r') as settings_file:
-                settings_config = yaml.safe_load(settings_file)
-                if settings_config: # Check if settings_config is not None
-                    configs.update(settings_config)
-                    logger.info(f"Loaded config from: {settings_path}")
-                else:
-                    logger.warning(f"Settings config file {settings_path} is empty or invalid YAML.")
+            settings_config = load_yaml(settings_path)
+            if settings_config: # Check if settings_config is not None
+                configs.update(settings_config)
+                logger.info(f"Loaded config from: {settings_path}")
+            else:
+                logger.warning(f"Settings config file {settings_path} is empty or invalid YAML.")
         except Exception as e:
             logger.error(f"Failed to load settings config from {settings_path}: {e}")
 
         # Load secrets.yaml and override settings if it exists
         if os.path.exists(secrets_path):
             try:
-                with open(secrets_path, 'r') as secrets_file:
-                    secrets_config = yaml.safe_load(secrets_file)
-                    if secrets_config: # Check if secrets_config is not None
-                        configs.update(secrets_config) # Secrets override settings
-                        logger.info(f"Loaded config from: {secrets_path}")
-                    else:
-                        logger.warning(f"Secrets config file {secrets_path} is empty or invalid YAML.")
+                secrets_config = load_yaml(secrets_path, use_snapshot=False)
+                if secrets_config: # Check if secrets_config is not None
+                    configs.update(secrets_config) # Secrets override settings
+                    logger.info(f"Loaded config from: {secrets_path}")
+                else:
+                    logger.warning(f"Secrets config file {secrets_path} is empty or invalid YAML.")
             except Exception as e:
                 logger.error(f"Failed to load secrets config {secrets_path}: {e}")
 
@@ -146,10 +145,20 @@ class TranscriptFetcher:
                          published_at: str, transcript: List[Dict[str, Any]]) -> bool:
         """
         Save transcript data to storage, both as JSON and plain text.
+        
+        Files are named {video_id}_{YYYYMMDD} after the publish date so readers
+        can skip old transcripts without opening them.
         """
         try:
+            # Encode the publish date in the file name when it can be parsed
+            file_stem = video_id
+            try:
+                file_stem = f"{video_id}_{datetime.fromisoformat(published_at.replace('Z', '+00:00')):%Y%m%d}"
+            except (AttributeError, ValueError):
+                logger.warning(f"Could not parse publish date {published_at!r} for video {video_id}")
+            
             # Save JSON format (as before)
-            file_path_json = os.path.join(self.storage_path, f"{video_id}.json")
+            file_path_json = os.path.join(self.storage_path, f"{file_stem}.json")
             data = {
                 "video_id": video_id,
                 "title": video_title,
@@ -163,12 +172,18 @@ class TranscriptFetcher:
             logger.info(f"Saved transcript (JSON) for video {video_id}")
 
             # Save plain text format
-            file_path_txt = os.path.join(self.storage_path, f"{video_id}.txt")
+            file_path_txt = os.path.join(self.storage_path, f"{file_stem}.txt")
             plain_text_transcript = self._process_transcript_to_plain_text(transcript) # Call new function
             with open(file_path_txt, 'w', encoding='utf-8') as file: # Ensure UTF-8 encoding
                 file.write(plain_text_transcript)
             logger.info(f"Saved transcript (plain text) for video {video_id}")
-
+            
+            # Drop copies saved under the old undated name so the video isn't loaded twice
+            if file_stem != video_id:
+                for extension in ('.json', '.txt'):
+                    legacy_path = os.path.join(self.storage_path, f"{video_id}{extension}")
+                    if os.path.exists(legacy_path):
+                        os.remove(legacy_path)
 
             return True
         except Exception as e:
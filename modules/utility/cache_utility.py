@@ -0,0 +1,147 @@
+"""
+Cache Utility Module
+
+This module provides a small key/value cache with expiry for data that is
+expensive to rebuild, such as latest prices and analyses. Redis is used when
+it is installed and configured, otherwise values are kept in process memory.
+"""
+
+import json
+import time
+import logging
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger('cache_utility')
+
+class MemoryCache:
+    """In-process cache with per-key expiry."""
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_json(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def set_json(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Cache a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache; callers must not mutate it afterwards
+            ttl: Time to live in seconds
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, key: str) -> None:
+        """Remove a key from the cache."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+class RedisCache:
+    """Redis-backed cache storing values as JSON, shared between processes."""
+
+    def __init__(self, url: str, prefix: str = 'ai_portfolio_manager:'):
+        """
+        Initialize the Redis cache.
+
+        Args:
+            url: Redis connection URL (e.g. redis://localhost:6379/0)
+            prefix: Prefix added to every key
+        """
+        self.client = redis.Redis.from_url(url, socket_timeout=1)
+        self.prefix = prefix
+
+    def get_json(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing, expired or Redis is unreachable
+        """
+        try:
+            payload = self.client.get(self.prefix + key)
+        except redis.RedisError as e:
+            logger.warning(f"Redis get failed for {key}: {e}")
+            return None
+        return json.loads(payload) if payload is not None else None
+
+    def set_json(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Cache a value.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value to cache
+            ttl: Time to live in seconds
+        """
+        try:
+            self.client.set(self.prefix + key, json.dumps(value, default=str), ex=max(1, int(ttl)))
+        except redis.RedisError as e:
+            logger.warning(f"Redis set failed for {key}: {e}")
+
+    def delete(self, key: str) -> None:
+        """Remove a key from the cache."""
+        try:
+            self.client.delete(self.prefix + key)
+        except redis.RedisError as e:
+            logger.warning(f"Redis delete failed for {key}: {e}")
+
+def create_cache(settings: Dict[str, Any]):
+    """
+    Create the cache configured in settings.
+
+    A Redis cache is used when system.cache.redis_url is set, the redis
+    package is installed and the server answers; otherwise an in-process
+    cache is returned.
+
+    Args:
+        settings: Parsed settings.yaml
+
+    Returns:
+        MemoryCache or RedisCache instance
+    """
+    cache_settings = settings.get('system', {}).get('cache') or {}
+    redis_url = cache_settings.get('redis_url')
+
+    if redis_url:
+        if not REDIS_AVAILABLE:
+            logger.warning("redis_url is configured but redis is not installed. Install with: pip install redis")
+        else:
+            try:
+                cache = RedisCache(redis_url)
+                cache.client.ping()
+                return cache
+            except redis.RedisError as e:
+                logger.warning(f"Redis unreachable at {redis_url}, using in-process cache: {e}")
+
+    return MemoryCache()
@@ -0,0 +1,162 @@
+"""
+Config Utility Module
+
+This module loads YAML configuration files through a process-wide cache so
+each file is parsed once no matter how many components read it.
+"""
+
+import os
+import json
+import logging
+import functools
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger('config_utility')
+
+# Parsed YAML files keyed by path, stored with the mtime (in ns) they were parsed at
+_YAML_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+# Suffix of the JSON snapshot written next to each parsed YAML file
+_JSON_CACHE_SUFFIX = ".cache.json"
+
+# Asset categories of assets.yaml, in order of precedence
+ASSET_CATEGORIES = ('crypto', 'stocks')
+
+@functools.lru_cache(maxsize=None)
+def _yaml_loader() -> type:
+    """Return PyYAML's libyaml-backed safe loader if available, else the pure-Python one."""
+    try:
+        from yaml import CSafeLoader as loader
+    except ImportError:
+        from yaml import SafeLoader as loader
+    return loader
+
+def _read_json_cache(file_path: str, stat: os.stat_result) -> Optional[Any]:
+    """
+    Read the JSON snapshot of a YAML file if it was taken from the file as it is now.
+    
+    Args:
+        file_path: Path to the YAML file
+        stat: Current stat of the YAML file
+        
+    Returns:
+        Parsed snapshot, or None if it is missing, stale or unreadable
+    """
+    cache_path = file_path + _JSON_CACHE_SUFFIX
+    try:
+        with open(cache_path, 'r') as file:
+            snapshot = json.load(file)
+    except (OSError, ValueError):
+        return None
+    
+    # The snapshot must match the YAML's exact mtime and size; a newer
+    # snapshot is not enough, as an older YAML may have been restored
+    if not isinstance(snapshot, dict) or snapshot.get('source') != _snapshot_source(stat):
+        return None
+    return snapshot.get('config')
+
+def _snapshot_source(stat: os.stat_result) -> Dict[str, int]:
+    """Identify the version of a YAML file a snapshot was taken from."""
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+def _write_json_cache(file_path: str, stat: os.stat_result, config: Any) -> None:
+    """
+    Write a JSON snapshot of a parsed YAML file.
+    
+    The snapshot is written to a temporary file and renamed into place so
+    concurrent readers never see a partial file. Documents that would not
+    read back identically from JSON (e.g. with dates or non-string keys) are
+    not snapshotted, so warm and cold loads always return the same value.
+    
+    Args:
+        file_path: Path to the YAML file
+        stat: Stat of the YAML file the config was parsed from
+        config: Parsed YAML content
+    """
+    cache_path = file_path + _JSON_CACHE_SUFFIX
+    try:
+        payload = json.dumps({'source': _snapshot_source(stat), 'config': config})
+        representable = json.loads(payload)['config'] == config
+    except (TypeError, ValueError):
+        representable = False
+    
+    if not representable:
+        logger.debug(f"Not snapshotting {file_path}: it does not round-trip through JSON")
+        try:
+            os.remove(cache_path)
+        except OSError:
+            pass
+        return
+    
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w') as file:
+            file.write(payload)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug(f"Could not write config cache {cache_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def load_yaml(file_path: str, use_snapshot: bool = True) -> Any:
+    """
+    Load a YAML file, reusing earlier parses.
+    
+    Parsed files are cached by path and only re-parsed when their
+    modification time changes. Unless disabled, a JSON snapshot is kept next
+    to each file so later processes can skip YAML parsing entirely. The
+    returned value is shared between callers and must not be mutated.
+    
+    Args:
+        file_path: Path to the YAML file
+        use_snapshot: Whether to read and write the JSON snapshot; disable
+            for files holding credentials
+        
+    Returns:
+        Parsed YAML content
+        
+    Raises:
+        OSError: If the file cannot be read
+        yaml.YAMLError: If the file is not valid YAML
+    """
+    # Integer nanoseconds compare exactly, unlike float st_mtime
+    stat = os.stat(file_path)
+    mtime_ns = stat.st_mtime_ns
+    cached = _YAML_CACHE.get(file_path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    
+    config = _read_json_cache(file_path, stat) if use_snapshot else None
+    if config is None:
+        import yaml
+        with open(file_path, 'rb') as file:
+            config = yaml.load(file, Loader=_yaml_loader())
+        if use_snapshot:
+            _write_json_cache(file_path, stat, config)
+    
+    _YAML_CACHE[file_path] = (mtime_ns, config)
+    return config
+
+def index_assets(assets: Dict[str, Any]) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    """
+    Index the assets of a parsed assets.yaml by symbol.
+    
+    A symbol listed more than once maps to its first entry, crypto before
+    stocks.
+    
+    Args:
+        assets: Parsed assets.yaml
+        
+    Returns:
+        Dictionary of symbol -> (category, asset info)
+    """
+    index = {}
+    for asset_category in ASSET_CATEGORIES:
+        for asset in assets.get(asset_category) or []:
+            symbol = asset.get('symbol')
+            if symbol and symbol not in index:
+                index[symbol] = (asset_category, asset)
+    return index
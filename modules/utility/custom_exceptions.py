@@ -0,0 +1,14 @@
+"""
+Custom Exceptions Module
+
+This module defines the exceptions raised by the API helpers.
+"""
+
+class APIError(Exception):
+    """An external API request failed."""
+
+class APIConnectionError(APIError):
+    """An external API could not be reached or timed out."""
+
+class APIRateLimitError(APIError):
+    """An external API rejected a request because of its rate limit."""
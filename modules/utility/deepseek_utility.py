@@ -0,0 +1,57 @@
+"""
+DeepSeek Utility Module
+
+This module hands out DeepSeek API clients with pooled connections, shared by
+every component in the process that talks to DeepSeek with the same key.
+"""
+
+import atexit
+import functools
+import importlib.util
+from typing import List
+
+import httpx
+from openai import OpenAI
+
+# With h2 installed, concurrent DeepSeek requests are multiplexed over one
+# HTTP/2 connection instead of each holding its own HTTP/1.1 connection.
+# httpx imports h2 itself, so only check that it is installed.
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+DEEPSEEK_BASE_URL = "https://api.deepseek.com"
+
+# Clients handed out by get_deepseek_client, closed at exit
+_DEEPSEEK_CLIENTS: List[OpenAI] = []
+
+@functools.lru_cache(maxsize=4)
+def get_deepseek_client(api_key: str, max_connections: int) -> OpenAI:
+    """
+    Get the DeepSeek client for an API key, shared by all callers using it.
+    
+    The client keeps enough connections alive for max_connections concurrent
+    requests, so only the first request on each pays for the TCP and TLS
+    handshakes, and callers created later reuse the warm pool. Callers must
+    not close the client; close_deepseek_clients does that at exit.
+    
+    Args:
+        api_key: DeepSeek API key
+        max_connections: Size of the connection pool
+        
+    Returns:
+        OpenAI client for the DeepSeek API
+    """
+    http_client = httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    )
+    client = OpenAI(api_key=api_key, base_url=DEEPSEEK_BASE_URL, http_client=http_client)
+    _DEEPSEEK_CLIENTS.append(client)
+    return client
+
+def close_deepseek_clients() -> None:
+    """Close the connection pools of all shared DeepSeek clients."""
+    get_deepseek_client.cache_clear()
+    while _DEEPSEEK_CLIENTS:
+        _DEEPSEEK_CLIENTS.pop().close()
+
+atexit.register(close_deepseek_clients)
@@ -7,6 +7,7 @@ It can be run independently to verify API connectivity and functionality.
 
 import json
 import argparse
+import httpx
 from openai import OpenAI
 import yaml
 import os
@@ -62,14 +63,19 @@ def load_api_key():
     print("DeepSeek API key not found. Please provide it with --api-key or set DEEPSEEK_API_KEY environment variable.")
     return None
 
-def test_reasoner_analysis(api_key, reasoner_model="deepseek-reasoner"):
-    """Test DeepSeek Reasoner for structured financial analysis."""
-    print(f"\n==== Testing DeepSeek Reasoner Analysis ({reasoner_model}) ====\n")
-    
-    client = OpenAI(
+def build_client(api_key):
+    """Create a DeepSeek client whose connections are kept alive between the tests."""
+    return OpenAI(
         api_key=api_key,
-        base_url="https://api.deepseek.com"
+        base_url="https://api.deepseek.com",
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
+        )
     )
+
+def test_reasoner_analysis(client, reasoner_model="deepseek-reasoner"):
+    """Test DeepSeek Reasoner for structured financial analysis."""
+    print(f"\n==== Testing DeepSeek Reasoner Analysis ({reasoner_model}) ====\n")
     
     # Sample analysis prompt for Bitcoin
     prompt = """
@@ -150,15 +156,10 @@ Include your assessment of market sentiment, key factors affecting price, and a
         print(f"\nError querying DeepSeek Reasoner API: {e}")
         return False
 
-def test_v3_function_calling(api_key, v3_model="deepseek-chat"):
+def test_v3_function_calling(client, v3_model="deepseek-chat"):
     """Test DeepSeek Chat for function calling based on financial analysis."""
     print(f"\n==== Testing DeepSeek Chat Function Calling ({v3_model}) ====\n")
     
-    client = OpenAI(
-        api_key=api_key,
-        base_url="https://api.deepseek.com"
-    )
-    
     # Sample analysis data that would come from Reasoner
     sample_analysis = """
 SENTIMENT: Bullish
@@ -318,13 +319,15 @@ def main():
     
     success = True
     
-    if run_reasoner:
-        reasoner_success = test_reasoner_analysis(api_key, args.reasoner_model)
-        success = success and reasoner_success
-    
-    if run_chat:
-        chat_success = test_v3_function_calling(api_key, args.chat_model)
-        success = success and chat_success
+    # One client for both tests, so the second reuses the first's connection
+    with build_client(api_key) as client:
+        if run_reasoner:
+            reasoner_success = test_reasoner_analysis(client, args.reasoner_model)
+            success = success and reasoner_success
+        
+        if run_chat:
+            chat_success = test_v3_function_calling(client, args.chat_model)
+            success = success and chat_success
     
     if success:
         print("\n✅ All tests passed successfully!")
@@ -0,0 +1,432 @@
+"""
+Tests for the Analysis Engine module.
+"""
+
+import os
+import json
+import time
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+from modules import analysis_engine
+from modules.analysis_engine import AnalysisEngine, _keyword_matcher, _loads, _repair_json, _symbols_matcher
+from modules.utility import config_utility
+
+SETTINGS_YAML = """apis:
+  deepseek:
+    cache_ttl_s: 3600
+"""
+
+ASSETS_YAML = """crypto:
+  - symbol: "BTC"
+    name: "Bitcoin"
+    tags: [store_of_value]
+  - symbol: "ETH"
+    name: "Ethereum"
+    tags: [smart_contracts]
+stocks:
+  - symbol: "NVDA"
+    name: "NVIDIA Corporation"
+    tags: [semiconductors]
+"""
+
+NARRATIVES_YAML = """narratives:
+  - name: ai_adoption
+    assets_affected: [NVDA, ETH]
+    keywords: [artificial intelligence, machine learning, llm]
+  - name: crypto_regulation
+    assets_affected: [BTC, ETH]
+    keywords: [sec, regulation]
+"""
+
+class RepairJsonTest(unittest.TestCase):
+    """_repair_json on almost-JSON model responses."""
+
+    def _repaired(self, text):
+        return _loads(_repair_json(text))
+
+    def test_valid_object_is_unchanged(self):
+        text = '{"a": [1, {"b": "c"}], "d": null}'
+        self.assertEqual(_repair_json(text), text)
+
+    def test_trailing_commas(self):
+        self.assertEqual(self._repaired('{"a": 1, "b": [1, 2,],}'), {"a": 1, "b": [1, 2]})
+        self.assertEqual(self._repaired('{"a": {"b": 1 ,\n},\n}'), {"a": {"b": 1}})
+
+    def test_commas_inside_strings_are_kept(self):
+        self.assertEqual(self._repaired('{"a": "x, ]", "b": "y,}", "c": [1,],}'), {"a": "x, ]", "b": "y,}", "c": [1]})
+
+    def test_text_around_the_object(self):
+        text = 'Here is the analysis:\n```json\n{"a": {"b": 1}}\n```\nLet me know {if} you need more.'
+        self.assertEqual(self._repaired(text), {"a": {"b": 1}})
+
+    def test_truncated_string(self):
+        self.assertEqual(self._repaired('{"sentiment": "bullish", "analysis_text": "Prices are'),
+                         {"sentiment": "bullish", "analysis_text": "Prices are"})
+
+    def test_truncated_nested_arrays(self):
+        self.assertEqual(self._repaired('{"a": [1, [2, 3'), {"a": [1, [2, 3]]})
+        self.assertEqual(self._repaired('{"points": [{"levels": [100, 200,'), {"points": [{"levels": [100, 200]}]})
+
+    def test_brackets_and_quotes_inside_strings(self):
+        text = '{"s": "has } and ] and { and \\" inside", "t": [1]} and {"another": 2}'
+        self.assertEqual(self._repaired(text), {"s": 'has } and ] and { and " inside', "t": [1]})
+
+    def test_unrepairable_input(self):
+        for text in ('no json at all', '{"a": tru}', '{"a": 1, "b":', ''):
+            with self.subTest(text=text):
+                with self.assertRaises(json.JSONDecodeError):
+                    self._repaired(text)
+
+class AnalysisEngineTestCase(unittest.TestCase):
+    """Creates an AnalysisEngine without a DeepSeek key on a temporary config."""
+
+    def setUp(self):
+        self.base_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base_path)
+        self.addCleanup(config_utility._YAML_CACHE.clear)
+
+        paths = {}
+        for name, text in (('settings', SETTINGS_YAML), ('assets', ASSETS_YAML), ('narratives', NARRATIVES_YAML)):
+            paths[name] = os.path.join(self.base_path, f'{name}.yaml')
+            with open(paths[name], 'w') as file:
+                file.write(text)
+
+        for name in ('transcripts', 'prices'):
+            paths[name] = os.path.join(self.base_path, name)
+            os.makedirs(paths[name])
+
+        self.engine = AnalysisEngine(
+            paths['settings'], paths['assets'], paths['narratives'],
+            paths['transcripts'], paths['prices'], os.path.join(self.base_path, 'analysis')
+        )
+
+class ResponseCacheTest(AnalysisEngineTestCase):
+    """Expiry and pruning of cached DeepSeek responses."""
+
+    def _cache(self, name, age):
+        cache_path = self.engine._llm_cache_path(name)
+        self.engine._cache_response(cache_path, {"name": name})
+        mtime = time.time() - age
+        os.utime(cache_path, (mtime, mtime))
+        return cache_path
+
+    def test_prune_removes_only_expired_responses(self):
+        fresh = self._cache('fresh', 60)
+        expired = self._cache('expired', 7200)
+        other = os.path.join(self.engine._llm_cache_dir, 'notes.txt')
+        with open(other, 'w') as file:
+            file.write('kept')
+        os.utime(other, (0, 0))
+
+        self.assertEqual(self.engine._prune_llm_cache(), 1)
+        self.assertTrue(os.path.exists(fresh))
+        self.assertFalse(os.path.exists(expired))
+        self.assertTrue(os.path.exists(other))
+        self.assertEqual(self.engine._cached_response(fresh), {"name": "fresh"})
+
+    def test_prune_without_cache_directory(self):
+        shutil.rmtree(self.engine._llm_cache_dir)
+        self.assertEqual(self.engine._prune_llm_cache(), 0)
+
+    def test_prune_disabled_with_cache(self):
+        expired = self._cache('expired', 7200)
+        self.engine.llm_cache_ttl = 0
+        self.assertEqual(self.engine._prune_llm_cache(), 0)
+        self.assertTrue(os.path.exists(expired))
+
+    def test_analyze_assets_prunes_once_per_run(self):
+        with mock.patch.object(self.engine, '_prune_llm_cache', return_value=0) as prune, \
+                mock.patch.object(self.engine, '_analyze_asset', return_value={}):
+            self.engine.analyze_assets(['BTC', 'ETH', 'NVDA'])
+        prune.assert_called_once_with()
+
+class TranscriptLoadingTest(AnalysisEngineTestCase):
+    """_load_transcripts age filtering."""
+
+    def _write(self, filename, published_at=None, age_days=0):
+        transcript = {"video_id": filename, "transcript": [{"text": "bitcoin"}]}
+        if published_at is not None:
+            transcript["published_at"] = published_at.isoformat()
+        path = os.path.join(self.engine.transcripts_path, filename)
+        with open(path, 'w') as file:
+            json.dump(transcript, file)
+        mtime = time.time() - age_days * 86400
+        os.utime(path, (mtime, mtime))
+
+    def _loaded(self):
+        with mock.patch.object(self.engine, '_load_transcript_file',
+                               wraps=self.engine._load_transcript_file) as load:
+            transcripts = self.engine._load_transcripts(max_age_days=30)
+        parsed = sorted(call.args[0] for call in load.call_args_list)
+        return sorted(transcript["video_id"] for transcript in transcripts), parsed
+
+    def test_age_filtering(self):
+        now = datetime.now(timezone.utc)
+        recent, old = now - timedelta(days=2), now - timedelta(days=60)
+        self._write(f"fresh_{recent:%Y%m%d}.json", recent, age_days=1)
+        self._write(f"published_old_{old:%Y%m%d}.json", old, age_days=1)
+        # Re-saved copies of a recent name with an old mtime, e.g. restored from a backup
+        self._write(f"written_old_{recent:%Y%m%d}.json", recent, age_days=45)
+        self._write("legacy_recent.json", recent, age_days=45)
+        self._write("legacy_old.json", old, age_days=45)
+        self._write("legacy_undated.json", None, age_days=45)
+
+        loaded, parsed = self._loaded()
+        self.assertEqual(loaded, [f"fresh_{recent:%Y%m%d}.json", "legacy_recent.json", "legacy_undated.json"])
+        # Only files named with their date are skipped without parsing
+        self.assertEqual(parsed, sorted([
+            f"fresh_{recent:%Y%m%d}.json", "legacy_old.json", "legacy_recent.json", "legacy_undated.json"
+        ]))
+
+    def test_file_removed_during_scan_is_skipped(self):
+        entry = SimpleNamespace(
+            name=f"gone_{datetime.now(timezone.utc):%Y%m%d}.json",
+            stat=mock.Mock(side_effect=FileNotFoundError)
+        )
+        self.assertTrue(self.engine._is_transcript_file_stale(entry, time.time() - 86400))
+
+class SymbolsMatcherTest(AnalysisEngineTestCase):
+    """_symbols_matcher against matching each asset's keywords separately."""
+
+    TEXTS = [
+        "",
+        "nothing to see here",
+        "bitcoin broke out overnight",
+        "the sec delayed the etf decision",
+        "give it a second, whether or not it moves",
+        "artificial intelligence demand keeps growing",
+        "artificial  intelligence with two spaces",
+        "machine learning chips from nvidia corporation",
+        "machine-learning is not the same phrase",
+        "btc, eth and nvda all moved on new regulation",
+        "an llm wrote this about ethereum",
+    ]
+
+    def _keywords_by_symbol(self):
+        return tuple(sorted(
+            (symbol, self.engine._asset_keywords(symbol, asset))
+            for symbol, (_, asset) in self.engine._asset_index.items()
+        ))
+
+    def _per_asset_symbols(self, keywords_by_symbol, text):
+        """Reference: the symbols whose own keywords occur in the text."""
+        return sorted(symbol for symbol, keywords in keywords_by_symbol if any(k in text for k in keywords))
+
+    def _assert_parity(self, keywords_by_symbol):
+        matcher = _symbols_matcher(keywords_by_symbol)
+        for text in self.TEXTS:
+            with self.subTest(text=text):
+                expected = self._per_asset_symbols(keywords_by_symbol, text)
+                self.assertEqual(sorted(matcher(text)), expected)
+                per_asset = sorted(symbol for symbol, keywords in keywords_by_symbol if _keyword_matcher(keywords)(text))
+                self.assertEqual(per_asset, expected)
+
+    def _in_each_mode(self, check):
+        """Run a check with Aho-Corasick, when installed, and with the regex fallback."""
+        modes = [False] + ([True] if analysis_engine.AHOCORASICK_AVAILABLE else [])
+        for available in modes:
+            with self.subTest(ahocorasick=available), \
+                    mock.patch.object(analysis_engine, 'AHOCORASICK_AVAILABLE', available):
+                # The matchers are cached by keywords alone, not by mode
+                _keyword_matcher.cache_clear()
+                _symbols_matcher.cache_clear()
+                try:
+                    check()
+                finally:
+                    _keyword_matcher.cache_clear()
+                    _symbols_matcher.cache_clear()
+
+    def test_narrative_keywords_match_like_per_asset_matchers(self):
+        keywords_by_symbol = self._keywords_by_symbol()
+        self.assertIn('artificial intelligence', dict(keywords_by_symbol)['NVDA'])
+        self._in_each_mode(lambda: self._assert_parity(keywords_by_symbol))
+
+    def test_shared_overlapping_and_empty_keywords(self):
+        keywords_by_symbol = (
+            ('A', frozenset({'sec', 'second'})),
+            ('B', frozenset({'sec', 'machine learning'})),
+            ('C', frozenset({'learning', 'eth'})),
+            ('D', frozenset({''})),
+            ('E', frozenset()),
+        )
+        self._in_each_mode(lambda: self._assert_parity(keywords_by_symbol))
+
+    def test_batch_extraction_matches_single_asset_extraction(self):
+        transcript = {
+            "title": "Weekly update",
+            "transcript": [{"text": text} for text in self.TEXTS if text],
+        }
+        assets = {symbol: asset for symbol, (_, asset) in self.engine._asset_index.items()}
+
+        def check():
+            batch = self.engine._extract_relevant_content_batch([transcript], assets)
+            for symbol, asset in assets.items():
+                self.assertEqual(batch[symbol], self.engine._extract_relevant_transcript_content([transcript], symbol, asset))
+            self.assertIn("artificial intelligence demand keeps growing", batch['NVDA'])
+            self.assertNotIn("two spaces", batch['NVDA'])
+
+        self._in_each_mode(check)
+
+def _tool_call(arguments, name='place_market_order'):
+    """Build a stand-in for a tool call in a chat completion response."""
+    if not isinstance(arguments, str):
+        arguments = json.dumps(arguments)
+    return SimpleNamespace(function=SimpleNamespace(name=name, arguments=arguments))
+
+def _completion(*tool_calls, content='Decisions made'):
+    """Build a stand-in for a chat completion response."""
+    message = SimpleNamespace(content=content, tool_calls=list(tool_calls) or None)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+BULLISH = {"sentiment": "bullish", "confidence": "high", "recommendation": "buy", "key_points": ["adoption"]}
+BEARISH = {"sentiment": "bearish", "confidence": "medium", "recommendation": "sell", "key_points": ["regulation"]}
+UNDECIDED = {"sentiment": "neutral", "confidence": "low", "recommendation": "hold", "key_points": []}
+
+class BatchedDecisionTest(AnalysisEngineTestCase):
+    """_process_analyses_with_v3 against a stubbed DeepSeek client."""
+
+    def setUp(self):
+        super().setUp()
+        self.create = mock.Mock()
+        self.engine.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=self.create)))
+
+        # Per-asset fallback, recording which assets went through it
+        self.fallbacks = []
+        def fallback(analysis_data, symbol, current_price):
+            self.fallbacks.append(symbol)
+            return {"function": "fallback", "arguments": {"symbol": symbol}}
+        patcher = mock.patch.object(self.engine, '_process_analysis_with_v3', side_effect=fallback)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _requested_symbols(self):
+        content = self.create.call_args.kwargs['messages'][1]['content']
+        assets = json.loads(content.split(':\n', 1)[1].split('\n\n', 1)[0])
+        return [asset['symbol'] for asset in assets]
+
+    def _pending(self):
+        return {'BTC': (BULLISH, 50000.0), 'ETH': (BEARISH, 3000.0), 'NVDA': (BULLISH, 900.0)}
+
+    def test_one_request_decides_all_assets(self):
+        self.create.return_value = _completion(
+            _tool_call({"symbol": "BTC", "action": "buy", "confidence": "high"}),
+            _tool_call({"symbol": "ETH", "action": "sell", "allocation_percentage": 4}),
+            _tool_call({"symbol": "NVDA", "action": "hold"}),
+        )
+        decisions = self.engine._process_analyses_with_v3(self._pending())
+
+        self.create.assert_called_once()
+        self.assertEqual(self._requested_symbols(), ['BTC', 'ETH', 'NVDA'])
+        self.assertEqual(self.fallbacks, [])
+        self.assertEqual(decisions['BTC']['function'], 'place_market_order')
+        self.assertEqual(decisions['BTC']['arguments']['allocation_percentage'], 10)
+        self.assertEqual(decisions['ETH']['arguments']['allocation_percentage'], 4)
+        self.assertEqual(decisions['NVDA']['arguments'], {"symbol": "NVDA", "action": "hold"})
+        self.assertEqual(decisions['NVDA']['model_response'], 'Decisions made')
+
+        # Decisions are cached per asset, so a rerun makes no request
+        self.create.reset_mock()
+        self.assertEqual(self.engine._process_analyses_with_v3(self._pending()), decisions)
+        self.create.assert_not_called()
+
+    def test_skipped_assets_fall_back_one_by_one(self):
+        self.create.return_value = _completion(
+            _tool_call({"symbol": "BTC", "action": "buy", "confidence": "high"}),
+        )
+        decisions = self.engine._process_analyses_with_v3(self._pending())
+
+        self.assertEqual(decisions['BTC']['function'], 'place_market_order')
+        self.assertEqual(sorted(self.fallbacks), ['ETH', 'NVDA'])
+        self.assertEqual(decisions['ETH'], {"function": "fallback", "arguments": {"symbol": "ETH"}})
+
+    def test_invalid_arguments_fall_back_one_by_one(self):
+        self.create.return_value = _completion(
+            _tool_call('{"symbol": "BTC", "action": '),
+            _tool_call({"symbol": "ETH"}),
+            _tool_call({"symbol": "DOGE", "action": "buy"}),
+            _tool_call({"symbol": "NVDA", "action": "buy", "confidence": "medium"}),
+            _tool_call({"symbol": "NVDA", "action": "sell"}),
+        )
+        decisions = self.engine._process_analyses_with_v3(self._pending())
+
+        self.assertEqual(sorted(self.fallbacks), ['BTC', 'ETH'])
+        self.assertNotIn('DOGE', decisions)
+        # The first call for an asset wins
+        self.assertEqual(decisions['NVDA']['arguments']['action'], 'buy')
+        self.assertEqual(decisions['NVDA']['arguments']['allocation_percentage'], 5)
+
+    def test_request_failure_falls_back_for_every_asset(self):
+        self.create.side_effect = RuntimeError("connection reset")
+        decisions = self.engine._process_analyses_with_v3(self._pending())
+
+        self.create.assert_called_once()
+        self.assertEqual(sorted(self.fallbacks), ['BTC', 'ETH', 'NVDA'])
+        self.assertEqual(set(decisions), {'BTC', 'ETH', 'NVDA'})
+
+    def test_no_tool_calls_falls_back_for_every_asset(self):
+        self.create.return_value = _completion()
+        self.engine._process_analyses_with_v3(self._pending())
+        self.assertEqual(sorted(self.fallbacks), ['BTC', 'ETH', 'NVDA'])
+
+    def test_clear_cut_analyses_are_not_sent(self):
+        pending = dict(self._pending(), NVDA=(UNDECIDED, 900.0))
+        self.create.return_value = _completion(
+            _tool_call({"symbol": "BTC", "action": "buy"}),
+            _tool_call({"symbol": "ETH", "action": "sell"}),
+        )
+        decisions = self.engine._process_analyses_with_v3(pending)
+
+        self.assertEqual(self._requested_symbols(), ['BTC', 'ETH'])
+        self.assertEqual(self.fallbacks, [])
+        self.assertEqual(decisions['NVDA'], self.engine._dummy_process_analysis(UNDECIDED, 'NVDA', 900.0))
+
+    def test_single_remaining_asset_skips_the_batch_request(self):
+        pending = {'BTC': (BULLISH, 50000.0), 'NVDA': (UNDECIDED, 900.0)}
+        self.engine._process_analyses_with_v3(pending)
+        self.create.assert_not_called()
+        self.assertEqual(self.fallbacks, ['BTC'])
+
+class GroupAnalysisCacheTest(AnalysisEngineTestCase):
+    """Caching of _analyze_group responses."""
+
+    def setUp(self):
+        super().setUp()
+        self.create = mock.Mock()
+        self.engine.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=self.create)))
+
+    def _respond(self, analyses):
+        self.create.return_value = _completion(content=json.dumps({"analyses": analyses}))
+
+    def _analyze(self):
+        return self.engine._analyze_group(['BTC', 'ETH'], {}, '2025-01-01')
+
+    def _entry(self, symbol, **fields):
+        entry = dict(BULLISH, symbol=symbol, trading_decision={"symbol": symbol, "action": "buy", "confidence": "high"})
+        entry.update(fields)
+        return entry
+
+    def test_response_without_usable_entries_is_not_cached(self):
+        self._respond([self._entry('BTC', trading_decision=None), self._entry('DOGE'), "not an object"])
+        self.assertEqual(self._analyze(), {})
+        self.assertEqual(os.listdir(self.engine._llm_cache_dir), [])
+
+        self._analyze()
+        self.assertEqual(self.create.call_count, 2)
+
+    def test_only_validated_entries_are_cached(self):
+        self._respond([self._entry('BTC'), self._entry('ETH', recommendation=None)])
+        first = self._analyze()
+        self.assertEqual(list(first), ['BTC'])
+
+        second = self._analyze()
+        self.create.assert_called_once()
+        self.assertEqual(second, first)
+        self.assertEqual(second['BTC']['trading_decision']['allocation_percentage'], 10)
+
+if __name__ == '__main__':
+    unittest.main()
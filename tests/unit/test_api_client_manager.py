@@ -0,0 +1,193 @@
+"""
+Tests for the API Client Manager module.
+"""
+
+import unittest
+from unittest import mock
+
+from modules import api_client_manager
+from modules.api_client_manager import APIClientManager, APIRateLimiter, api_request
+from modules.utility.custom_exceptions import APIRateLimitError
+
+def _response(status_code=200, payload=None, headers=None):
+    """Build a stand-in for a requests.Response."""
+    response = mock.Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = payload
+    return response
+
+class APIRequestTest(unittest.TestCase):
+    """api_request session handling and error mapping."""
+
+    def test_requests_share_one_session(self):
+        session = api_client_manager._get_default_session()
+        self.assertIs(api_client_manager._get_default_session(), session)
+
+        with mock.patch.object(session, 'request', return_value=_response(payload={"ok": True})) as request, \
+                mock.patch.object(session, 'close') as close:
+            self.assertEqual(api_request("https://example.com/a"), {"ok": True})
+            self.assertEqual(api_request("https://example.com/b", method="POST", data={"x": 1}), {"ok": True})
+
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(request.call_args.kwargs['json'], {"x": 1})
+        close.assert_not_called()
+
+    def test_explicit_session_is_used(self):
+        session = mock.Mock()
+        session.request.return_value = _response(payload=[1, 2])
+        self.assertEqual(api_request("https://example.com", session=session, timeout=5), [1, 2])
+        self.assertEqual(session.request.call_args.kwargs['timeout'], 5)
+
+    def test_rate_limit_response_raises(self):
+        session = mock.Mock()
+        session.request.return_value = _response(status_code=429, headers={'Retry-After': '7'})
+        with self.assertRaises(APIRateLimitError):
+            api_request("https://example.com", session=session)
+
+    def test_manager_requests_use_its_session(self):
+        manager = APIClientManager()
+        with mock.patch.object(manager.session, 'request', return_value=_response(payload={"ok": True})) as request:
+            self.assertEqual(manager.request("https://example.com", params={"q": 1}), {"ok": True})
+        self.assertEqual(request.call_args.kwargs['params'], {"q": 1})
+
+class SessionSetupTest(unittest.TestCase):
+    """Retry policies and pool sizes of the sessions."""
+
+    def test_sessions_share_the_module_retry_policies(self):
+        first = APIClientManager().session.get_adapter("https://example.com")
+        second = APIClientManager().session.get_adapter("https://example.com")
+        self.assertIsNot(first, second)
+        self.assertIs(first.max_retries, api_client_manager._CLIENT_RETRY)
+        self.assertIs(second.max_retries, api_client_manager._CLIENT_RETRY)
+        self.assertEqual(first._pool_maxsize, api_client_manager.POOL_MAXSIZE)
+
+        default = api_client_manager._get_default_session().get_adapter("https://example.com")
+        self.assertIs(default.max_retries, api_client_manager._REQUEST_RETRY)
+        self.assertEqual(default._pool_maxsize, api_client_manager.POOL_MAXSIZE)
+
+class DeepSeekClientTest(unittest.TestCase):
+    """DeepSeek clients handed out by the manager."""
+
+    def setUp(self):
+        from modules.utility import deepseek_utility
+        self.deepseek_utility = deepseek_utility
+        self.addCleanup(deepseek_utility.close_deepseek_clients)
+
+        secrets_manager = mock.Mock()
+        secrets_manager.get_api_keys.return_value = {'api_key': 'test-key'}
+        self.manager = APIClientManager(secrets_manager=secrets_manager)
+
+    def test_client_is_shared_with_other_components(self):
+        client = self.manager.get_deepseek_client(is_analysis=True)
+        self.assertIs(self.manager.get_deepseek_client(is_analysis=False), client)
+        self.assertIs(self.deepseek_utility.get_deepseek_client('test-key', 8), client)
+
+    def test_close_all_clients_leaves_shared_client_open(self):
+        client = self.manager.get_deepseek_client()
+        with mock.patch.object(client, 'close') as close:
+            self.manager.close_all_clients()
+        close.assert_not_called()
+
+    def test_missing_key_returns_none(self):
+        self.manager.secrets_manager.get_api_keys.return_value = {}
+        self.assertIsNone(self.manager.get_deepseek_client())
+
+class CredentialsCacheTest(unittest.TestCase):
+    """Credentials looked up through the secrets manager."""
+
+    def setUp(self):
+        self.secrets_manager = mock.Mock()
+        self.secrets_manager.get_api_keys.side_effect = lambda name: {'api_key': f'{name}-key'}
+        self.manager = APIClientManager(secrets_manager=self.secrets_manager)
+
+    def test_credentials_are_fetched_once_per_service(self):
+        self.assertEqual(self.manager._creds('deepseek'), {'api_key': 'deepseek-key'})
+        self.assertEqual(self.manager._creds('deepseek'), {'api_key': 'deepseek-key'})
+        self.assertEqual(self.manager._creds('youtube_api'), {'api_key': 'youtube_api-key'})
+        self.assertEqual(
+            [call.args for call in self.secrets_manager.get_api_keys.call_args_list],
+            [('deepseek',), ('youtube_api',)]
+        )
+
+    def test_invalidate_one_service(self):
+        self.manager._creds('deepseek')
+        self.manager._creds('kucoin')
+        self.manager.invalidate_credentials('deepseek')
+        self.manager._creds('deepseek')
+        self.manager._creds('kucoin')
+        self.assertEqual(self.secrets_manager.get_api_keys.call_count, 3)
+
+    def test_invalidate_all_services(self):
+        self.manager._creds('deepseek')
+        self.manager._creds('kucoin')
+        self.manager.invalidate_credentials()
+        self.manager._creds('deepseek')
+        self.manager._creds('kucoin')
+        self.assertEqual(self.secrets_manager.get_api_keys.call_count, 4)
+
+    def test_no_secrets_manager(self):
+        self.assertEqual(APIClientManager()._creds('deepseek'), {})
+
+class APIRateLimiterTest(unittest.TestCase):
+    """Token bucket behaviour of APIRateLimiter, on a fake clock."""
+
+    def setUp(self):
+        self.now = 1000.0
+        self.sleeps = []
+        patchers = [
+            mock.patch.object(api_client_manager.time, 'monotonic', side_effect=lambda: self.now),
+            mock.patch.object(api_client_manager.time, 'sleep', side_effect=self.sleeps.append),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _calls(self, limiter, count, endpoint='prices'):
+        """Make calls and return the sleeps they caused."""
+        del self.sleeps[:]
+        for _ in range(count):
+            limiter.wait_if_needed(endpoint)
+        return list(self.sleeps)
+
+    def test_burst_goes_out_without_waiting(self):
+        limiter = APIRateLimiter(calls_per_minute=60, burst=3)
+        self.assertEqual(self._calls(limiter, 3), [])
+
+    def test_calls_beyond_burst_are_spaced_at_the_rate(self):
+        limiter = APIRateLimiter(calls_per_minute=60, burst=3)
+        self._calls(limiter, 3)
+        # Each caller reserves the next token, so waits queue up
+        sleeps = self._calls(limiter, 2)
+        self.assertEqual(len(sleeps), 2)
+        self.assertAlmostEqual(sleeps[0], 1.0)
+        self.assertAlmostEqual(sleeps[1], 2.0)
+
+    def test_tokens_refill_over_time(self):
+        limiter = APIRateLimiter(calls_per_minute=120, burst=4)
+        self._calls(limiter, 4)
+        self.now += 1.0  # Two tokens at 2 per second
+        sleeps = self._calls(limiter, 3)
+        self.assertEqual(len(sleeps), 1)
+        self.assertAlmostEqual(sleeps[0], 0.5)
+
+    def test_refill_is_capped_at_burst(self):
+        limiter = APIRateLimiter(calls_per_minute=60, burst=2)
+        self._calls(limiter, 2)
+        self.now += 3600
+        sleeps = self._calls(limiter, 3)
+        self.assertEqual(len(sleeps), 1)
+        self.assertAlmostEqual(sleeps[0], 1.0)
+
+    def test_endpoints_have_separate_buckets(self):
+        limiter = APIRateLimiter(calls_per_minute=60, burst=1)
+        self.assertEqual(self._calls(limiter, 1, 'prices'), [])
+        self.assertEqual(self._calls(limiter, 1, 'orders'), [])
+        self.assertEqual(len(self._calls(limiter, 1, 'prices')), 1)
+
+    def test_default_burst(self):
+        self.assertEqual(APIRateLimiter(calls_per_minute=60).burst, 6)
+        self.assertEqual(APIRateLimiter(calls_per_minute=5).burst, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+Tests for the Cache Utility module.
+"""
+
+import json
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from modules.utility import cache_utility
+from modules.utility.cache_utility import MemoryCache, RedisCache, create_cache
+
+class FakeRedisError(Exception):
+    """Stands in for redis.RedisError."""
+
+class FakeRedisClient:
+    """Minimal in-memory stand-in for a redis.Redis client, on a settable clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.store = {}
+        self.calls = []
+        self.fail = False
+
+    def _check(self, name, *args, **kwargs):
+        self.calls.append((name, args, kwargs))
+        if self.fail:
+            raise FakeRedisError("connection refused")
+
+    def get(self, key):
+        self._check('get', key)
+        entry = self.store.get(key)
+        if entry is None or entry[0] <= self.now:
+            return None
+        return entry[1]
+
+    def set(self, key, value, ex):
+        self._check('set', key, value, ex=ex)
+        self.store[key] = (self.now + ex, value.encode('utf-8'))
+
+    def delete(self, key):
+        self._check('delete', key)
+        self.store.pop(key, None)
+
+    def ping(self):
+        self._check('ping')
+        return True
+
+class FakeRedisTestCase(unittest.TestCase):
+    """Replaces the redis module used by cache_utility with an in-memory fake."""
+
+    def setUp(self):
+        self.client = FakeRedisClient()
+        self.from_url = mock.Mock(return_value=self.client)
+        fake_redis = SimpleNamespace(Redis=SimpleNamespace(from_url=self.from_url), RedisError=FakeRedisError)
+        patchers = [
+            mock.patch.object(cache_utility, 'redis', fake_redis, create=True),
+            mock.patch.object(cache_utility, 'REDIS_AVAILABLE', True),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+class MemoryCacheTest(unittest.TestCase):
+    """MemoryCache get/set, expiry and deletion."""
+
+    def setUp(self):
+        self.now = 100.0
+        patcher = mock.patch.object(cache_utility.time, 'monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = MemoryCache()
+
+    def test_missing_key(self):
+        self.assertIsNone(self.cache.get_json('prices'))
+
+    def test_set_and_get(self):
+        value = {"BTC": {"price": 50000.0}}
+        self.cache.set_json('prices', value, ttl=60)
+        self.assertIs(self.cache.get_json('prices'), value)
+
+        self.cache.set_json('prices', {"BTC": {"price": 51000.0}}, ttl=60)
+        self.assertEqual(self.cache.get_json('prices'), {"BTC": {"price": 51000.0}})
+
+    def test_values_expire_after_ttl(self):
+        self.cache.set_json('prices', [1], ttl=60)
+        self.now += 59.9
+        self.assertEqual(self.cache.get_json('prices'), [1])
+        self.now += 0.1
+        self.assertIsNone(self.cache.get_json('prices'))
+        self.assertNotIn('prices', self.cache._entries)
+
+    def test_keys_expire_independently(self):
+        self.cache.set_json('short', 1, ttl=10)
+        self.cache.set_json('long', 2, ttl=100)
+        self.now += 50
+        self.assertIsNone(self.cache.get_json('short'))
+        self.assertEqual(self.cache.get_json('long'), 2)
+
+    def test_delete(self):
+        self.cache.set_json('prices', [1], ttl=60)
+        self.cache.delete('prices')
+        self.cache.delete('never_set')
+        self.assertIsNone(self.cache.get_json('prices'))
+
+class RedisCacheTest(FakeRedisTestCase):
+    """RedisCache against a fake Redis client."""
+
+    def setUp(self):
+        super().setUp()
+        self.cache = RedisCache('redis://localhost:6379/0')
+
+    def test_connects_with_short_timeout(self):
+        self.from_url.assert_called_once_with('redis://localhost:6379/0', socket_timeout=1)
+
+    def test_values_round_trip_as_prefixed_json(self):
+        self.cache.set_json('prices', {"BTC": {"price": 50000.0}}, ttl=60)
+        self.assertEqual(self.cache.get_json('prices'), {"BTC": {"price": 50000.0}})
+
+        key = 'ai_portfolio_manager:prices'
+        self.assertEqual(json.loads(self.client.store[key][1]), {"BTC": {"price": 50000.0}})
+        self.assertIsNone(self.cache.get_json('missing'))
+
+    def test_values_expire_after_ttl(self):
+        self.cache.set_json('prices', [1], ttl=60)
+        self.client.now += 59
+        self.assertEqual(self.cache.get_json('prices'), [1])
+        self.client.now += 1
+        self.assertIsNone(self.cache.get_json('prices'))
+
+    def test_ttl_is_whole_seconds_of_at_least_one(self):
+        self.cache.set_json('a', 1, ttl=0.2)
+        self.cache.set_json('b', 1, ttl=90.7)
+        self.assertEqual([call[2]['ex'] for call in self.client.calls], [1, 90])
+
+    def test_delete(self):
+        self.cache.set_json('prices', [1], ttl=60)
+        self.cache.delete('prices')
+        self.assertIsNone(self.cache.get_json('prices'))
+
+    def test_redis_errors_behave_like_misses(self):
+        self.cache.set_json('prices', [1], ttl=60)
+        self.client.fail = True
+        self.assertIsNone(self.cache.get_json('prices'))
+        self.cache.set_json('prices', [2], ttl=60)
+        self.cache.delete('prices')
+
+        self.client.fail = False
+        self.assertEqual(self.cache.get_json('prices'), [1])
+
+class CreateCacheTest(FakeRedisTestCase):
+    """create_cache choosing between Redis and memory."""
+
+    def _settings(self, redis_url):
+        return {'system': {'cache': {'redis_url': redis_url}}}
+
+    def test_memory_cache_without_redis_url(self):
+        for settings in ({}, {'system': {}}, {'system': {'cache': None}}, self._settings(None)):
+            with self.subTest(settings=settings):
+                self.assertIsInstance(create_cache(settings), MemoryCache)
+        self.from_url.assert_not_called()
+
+    def test_redis_cache_when_reachable(self):
+        cache = create_cache(self._settings('redis://localhost:6379/0'))
+        self.assertIsInstance(cache, RedisCache)
+        self.assertIs(cache.client, self.client)
+        self.assertEqual(self.client.calls[0][0], 'ping')
+
+    def test_memory_cache_when_redis_unreachable(self):
+        self.client.fail = True
+        with self.assertLogs('cache_utility', level='WARNING'):
+            cache = create_cache(self._settings('redis://localhost:6379/0'))
+        self.assertIsInstance(cache, MemoryCache)
+
+    def test_memory_cache_when_redis_not_installed(self):
+        with mock.patch.object(cache_utility, 'REDIS_AVAILABLE', False), \
+                self.assertLogs('cache_utility', level='WARNING'):
+            cache = create_cache(self._settings('redis://localhost:6379/0'))
+        self.assertIsInstance(cache, MemoryCache)
+        self.from_url.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Tests for the Config Utility module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+import yaml
+
+from modules.utility import config_utility
+from modules.utility.config_utility import index_assets, load_yaml
+
+class LoadYamlTest(unittest.TestCase):
+    """load_yaml parsing, in-process caching and JSON snapshots."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'settings.yaml')
+        self.snapshot_path = self.path + config_utility._JSON_CACHE_SUFFIX
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.addCleanup(config_utility._YAML_CACHE.clear)
+
+    def _write(self, text, mtime_ns=None):
+        with open(self.path, 'w') as file:
+            file.write(text)
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def _load_in_new_process(self, **kwargs):
+        """Load as a fresh process would, with only the on-disk snapshot to go on."""
+        config_utility._YAML_CACHE.clear()
+        with mock.patch.object(yaml, 'load', wraps=yaml.load) as parse:
+            config = load_yaml(self.path, **kwargs)
+        return config, parse.called
+
+    def test_warm_load_uses_snapshot(self):
+        self._write("system:\n  data_refresh_interval: 3600\n")
+        cold, parsed = self._load_in_new_process()
+        self.assertTrue(parsed)
+        self.assertTrue(os.path.exists(self.snapshot_path))
+
+        warm, parsed = self._load_in_new_process()
+        self.assertFalse(parsed)
+        self.assertEqual(warm, cold)
+        self.assertEqual(warm, {'system': {'data_refresh_interval': 3600}})
+
+    def test_repeated_loads_share_the_parsed_value(self):
+        self._write("a: 1\n")
+        self.assertIs(load_yaml(self.path), load_yaml(self.path))
+
+    def test_restored_older_yaml_ignores_newer_snapshot(self):
+        self._write("value: old\n", mtime_ns=1_600_000_000_000_000_000)
+        old_config, _ = self._load_in_new_process()
+        self._write("value: new\n", mtime_ns=1_700_000_000_000_000_000)
+        self._load_in_new_process()
+
+        # e.g. git checkout or cp -p of the old file; the snapshot is newer
+        self._write("value: old\n", mtime_ns=1_600_000_000_000_000_000)
+        config, parsed = self._load_in_new_process()
+        self.assertTrue(parsed)
+        self.assertEqual(config, old_config)
+        self.assertEqual(config, {'value': 'old'})
+
+    def test_same_mtime_different_size_ignores_snapshot(self):
+        self._write("value: 1\n", mtime_ns=1_600_000_000_000_000_000)
+        self._load_in_new_process()
+        self._write("value: 12345\n", mtime_ns=1_600_000_000_000_000_000)
+
+        config, parsed = self._load_in_new_process()
+        self.assertTrue(parsed)
+        self.assertEqual(config, {'value': 12345})
+
+    def test_documents_json_cannot_represent_are_not_snapshotted(self):
+        cases = {
+            'int keys': ("levels:\n  1: low\n  2: high\n", {'levels': {1: 'low', 2: 'high'}}),
+            'dates': ("start_date: 2023-01-01\n", {'start_date': date(2023, 1, 1)}),
+        }
+        for name, (text, expected) in cases.items():
+            with self.subTest(name):
+                self._write(text)
+                cold, _ = self._load_in_new_process()
+                warm, parsed = self._load_in_new_process()
+                self.assertTrue(parsed)
+                self.assertEqual(cold, expected)
+                self.assertEqual(warm, expected)
+                self.assertFalse(os.path.exists(self.snapshot_path))
+
+    def test_snapshot_can_be_disabled(self):
+        self._write("api_key: secret\n")
+        config, _ = self._load_in_new_process(use_snapshot=False)
+        self.assertEqual(config, {'api_key': 'secret'})
+        self.assertFalse(os.path.exists(self.snapshot_path))
+
+class IndexAssetsTest(unittest.TestCase):
+    """index_assets precedence between duplicate symbols."""
+
+    def test_first_entry_wins_crypto_before_stocks(self):
+        assets = {
+            'stocks': [{'symbol': 'BTC', 'name': 'Bitcoin Trust'}, {'symbol': 'NVDA', 'name': 'NVIDIA'}],
+            'crypto': [
+                {'symbol': 'BTC', 'name': 'Bitcoin'},
+                {'symbol': 'ETH', 'name': 'Ethereum'},
+                {'symbol': 'ETH', 'name': 'Ethereum again'},
+                {'name': 'No symbol'},
+            ],
+            'bonds': [{'symbol': 'TLT'}],
+        }
+        index = index_assets(assets)
+        self.assertEqual(list(index), ['BTC', 'ETH', 'NVDA'])
+        self.assertEqual(index['BTC'], ('crypto', {'symbol': 'BTC', 'name': 'Bitcoin'}))
+        self.assertEqual(index['ETH'][1]['name'], 'Ethereum')
+        self.assertEqual(index['NVDA'][0], 'stocks')
+
+    def test_missing_or_empty_categories(self):
+        self.assertEqual(index_assets({}), {})
+        self.assertEqual(index_assets({'crypto': None, 'stocks': [{'symbol': 'AAPL'}]}), {'AAPL': ('stocks', {'symbol': 'AAPL'})})
+
+if __name__ == '__main__':
+    unittest.main()
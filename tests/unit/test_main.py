@@ -0,0 +1,168 @@
+"""
+Tests for the AIPortfolioManager in main.py.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import main
+from main import AIPortfolioManager
+
+REPO_CONFIG_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'config')
+
+ASSETS_YAML = """crypto:
+  - symbol: "BTC"
+    name: "Bitcoin"
+    exchange: "kucoin"
+"""
+
+class AssetReloadTest(unittest.TestCase):
+    """Reloading assets.yaml between scheduled cycles."""
+
+    def setUp(self):
+        self.base_path = tempfile.mkdtemp()
+        config_dir = os.path.join(self.base_path, 'config')
+        os.makedirs(config_dir)
+        for name in ('settings.yaml', 'narratives.yaml'):
+            shutil.copy(os.path.join(REPO_CONFIG_DIR, name), config_dir)
+        self.assets_path = os.path.join(config_dir, 'assets.yaml')
+        self._write_assets(ASSETS_YAML)
+
+        self.manager = AIPortfolioManager(base_path=self.base_path, test_mode=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.base_path)
+
+    def _write_assets(self, text):
+        """Write assets.yaml, making sure its mtime moves forward."""
+        previous = os.stat(self.assets_path).st_mtime_ns if os.path.exists(self.assets_path) else 0
+        with open(self.assets_path, 'w') as file:
+            file.write(text)
+        mtime = max(os.stat(self.assets_path).st_mtime_ns, previous + 1_000_000_000)
+        os.utime(self.assets_path, ns=(mtime, mtime))
+
+    def test_scheduler_rebuilds_sub_modules_when_assets_change(self):
+        manager = self.manager
+        seen = []
+
+        def run_cycle(*args, **kwargs):
+            seen.append((manager.order_manager, list(manager.crypto_symbols)))
+            if len(seen) == 1:
+                self._write_assets(ASSETS_YAML + '  - symbol: "KAS"\n    name: "Kaspa"\n    exchange: "kucoin"\n')
+            else:
+                manager.stop()
+
+        manager.run_full_cycle = run_cycle
+        manager.run_scheduler(interval_hours=0)
+
+        (first_orders, first_symbols), (second_orders, second_symbols) = seen
+        self.assertEqual(first_symbols, ['BTC'])
+        self.assertEqual(second_symbols, ['BTC', 'KAS'])
+        self.assertIsNot(first_orders, second_orders)
+        self.assertNotIn('KAS', first_orders._asset_index)
+        self.assertIn('KAS', second_orders._asset_index)
+
+    def test_reload_assets_keeps_sub_modules_when_unchanged(self):
+        manager = self.manager
+        self.assertFalse(manager.reload_assets())
+        order_manager = manager.order_manager
+
+        self.assertFalse(manager.reload_assets())
+        self.assertIs(manager.order_manager, order_manager)
+
+        self._write_assets(ASSETS_YAML.replace('Bitcoin', 'Bitcoin Core'))
+        self.assertTrue(manager.reload_assets())
+        self.assertIsNot(manager.order_manager, order_manager)
+
+    def test_reload_assets_sees_sub_microsecond_mtime_changes(self):
+        manager = self.manager
+        mtime = 1_700_000_000_123_456_700
+        os.utime(self.assets_path, ns=(mtime, mtime))
+        manager.reload_assets()
+
+        # Same float st_mtime, one nanosecond apart
+        with open(self.assets_path, 'w') as file:
+            file.write(ASSETS_YAML + '  - symbol: "KAS"\n    name: "Kaspa"\n    exchange: "kucoin"\n')
+        os.utime(self.assets_path, ns=(mtime + 1, mtime + 1))
+        self.assertTrue(manager.reload_assets())
+        self.assertEqual(manager.crypto_symbols, ['BTC', 'KAS'])
+
+class SchedulerTest(unittest.TestCase):
+    """run_scheduler timing, on a fake clock."""
+
+    def setUp(self):
+        self.base_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base_path)
+        config_dir = os.path.join(self.base_path, 'config')
+        os.makedirs(config_dir)
+        for name in ('settings.yaml', 'narratives.yaml'):
+            shutil.copy(os.path.join(REPO_CONFIG_DIR, name), config_dir)
+        with open(os.path.join(config_dir, 'assets.yaml'), 'w') as file:
+            file.write(ASSETS_YAML)
+        self.manager = AIPortfolioManager(base_path=self.base_path, test_mode=True)
+
+        self.now = 1000.0
+        self.cycle_starts = []
+        self.sleeps = []
+        patcher = mock.patch.object(main.time, 'monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run(self, cycle_durations):
+        """Run cycles taking the given seconds each, returning the sleeps between them."""
+        durations = iter(cycle_durations)
+
+        def run_cycle(*args, **kwargs):
+            self.cycle_starts.append(self.now)
+            self.now += next(durations)
+
+        def wait(timeout):
+            self.sleeps.append(timeout)
+            self.now += timeout
+            if len(self.sleeps) == len(cycle_durations):
+                self.manager.stop()
+            return self.manager._stop.is_set()
+
+        self.manager.run_full_cycle = run_cycle
+        with mock.patch.object(self.manager._stop, 'wait', side_effect=wait):
+            self.manager.run_scheduler(interval_hours=1)
+        return self.sleeps
+
+    def test_cycle_duration_does_not_delay_the_schedule(self):
+        self.assertEqual(self._run([10, 600, 0]), [3590, 3000, 3600])
+        self.assertEqual(self.cycle_starts, [1000, 4600, 8200])
+
+    def test_overrun_cycle_does_not_cause_back_to_back_catch_up_cycles(self):
+        sleeps = self._run([10, 3 * 3600 + 100, 10, 10])
+        self.assertEqual(sleeps, [3590, 0, 3590, 3590])
+        gaps = [later - earlier for earlier, later in zip(self.cycle_starts, self.cycle_starts[1:])]
+        self.assertEqual(gaps, [3600, 3 * 3600 + 100, 3600])
+
+class OrderCommandTest(unittest.TestCase):
+    """--buy and --sell passing the resolved confirmation setting."""
+
+    def _run(self, *argv):
+        with mock.patch.object(main, 'AIPortfolioManager') as manager_class:
+            main.main(list(argv))
+        return manager_class.return_value
+
+    def test_confirmation_flags(self):
+        cases = [((), None), (('--confirm',), True), (('--auto',), False)]
+        for flags, confirm in cases:
+            with self.subTest(flags=flags):
+                manager = self._run('--buy', '--symbol', 'BTC', '--amount', '25', *flags)
+                manager.buy_asset.assert_called_once_with('BTC', 25.0, None, confirm)
+
+                manager = self._run('--sell', '--symbol', 'ETH', '--amount', '10', '--price', '3000', *flags)
+                manager.sell_asset.assert_called_once_with('ETH', 10.0, 3000.0, confirm)
+
+    def test_missing_amount_places_no_order(self):
+        with mock.patch('builtins.print'):
+            manager = self._run('--buy', '--symbol', 'BTC')
+        manager.buy_asset.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
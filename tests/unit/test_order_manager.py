@@ -0,0 +1,175 @@
+"""
+Tests for the OrderManager module.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from modules.order_manager import OrderManager
+from modules.utility import config_utility
+from modules.utility.config_utility import load_yaml
+
+SETTINGS_YAML = """system:
+  trade_confirmation: false
+  max_allocation_per_asset: 0.2
+"""
+
+ASSETS_YAML = """crypto:
+  - symbol: "BTC"
+    name: "Bitcoin"
+    exchange: "kucoin"
+  - symbol: "XMR"
+    name: "Monero"
+    exchange: "kucoin"
+stocks:
+  - symbol: "NVDA"
+    name: "NVIDIA Corporation"
+"""
+
+class OrderManagerTestCase(unittest.TestCase):
+    """Creates an OrderManager in test mode on a temporary config."""
+
+    def setUp(self):
+        self.base_path = tempfile.mkdtemp()
+        config_path = os.path.join(self.base_path, 'settings.yaml')
+        assets_path = os.path.join(self.base_path, 'assets.yaml')
+        with open(config_path, 'w') as file:
+            file.write(SETTINGS_YAML)
+        with open(assets_path, 'w') as file:
+            file.write(ASSETS_YAML)
+        self.orders_path = os.path.join(self.base_path, 'orders')
+        self.manager = OrderManager(config_path, assets_path, output_path=self.orders_path, test_mode=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.base_path)
+
+def _per_signal_order(manager, signal, timestamp):
+    """
+    Reference implementation: the per-signal sizing create_orders_from_signals
+    used before decisions were computed for the whole batch.
+    """
+    symbol = signal.get('symbol')
+    action = signal.get('action')
+    if not symbol or action == "NONE" or action == "HOLD":
+        return None
+    if not manager._get_asset_info(symbol):
+        return None
+
+    side = "buy" if action == "BUY" else "sell"
+    confidence = signal.get('confidence', 'LOW')
+    if confidence == "HIGH":
+        allocation = manager.max_allocation
+    elif confidence == "MEDIUM":
+        allocation = manager.max_allocation * 0.6
+    else:
+        allocation = manager.max_allocation * 0.3
+
+    return {
+        "symbol": symbol,
+        "type": "market",
+        "side": side,
+        "amount": 1000.0 * allocation,
+        "reason": f"Signal {action} with {signal.get('confidence', 'LOW')} confidence",
+        "analysis_id": signal.get('analysis_id'),
+        "timestamp": timestamp
+    }
+
+class OrderDecisionTest(OrderManagerTestCase):
+    """Batch order creation against the per-signal logic."""
+
+    def _signals(self):
+        signals = []
+        for symbol in ('BTC', 'NVDA', 'DOGE', None):
+            for action in ('BUY', 'SELL', 'HOLD', 'NONE', 'ACCUMULATE', None):
+                for confidence in ('HIGH', 'MEDIUM', 'LOW', 'UNKNOWN', None):
+                    signal = {"symbol": symbol, "action": action, "analysis_id": f"{symbol}-{action}-{confidence}"}
+                    if confidence is not None:
+                        signal["confidence"] = confidence
+                    signals.append(signal)
+        return signals
+
+    def test_batch_orders_match_per_signal_orders(self):
+        signals = self._signals()
+        for max_allocation in (0.2, 0.15, 0.07):
+            with self.subTest(max_allocation=max_allocation):
+                self.manager.max_allocation = max_allocation
+                orders = self.manager.create_orders_from_signals(signals)
+                self.assertTrue(orders)
+                timestamp = orders[0]['timestamp']
+
+                expected = [_per_signal_order(self.manager, signal, timestamp) for signal in signals]
+                self.assertEqual(orders, [order for order in expected if order])
+
+    def test_single_signal_matches_per_signal_order(self):
+        for signal in self._signals():
+            with self.subTest(signal=signal):
+                order = self.manager.create_order_from_signal(signal, timestamp='2025-01-01T00:00:00+00:00')
+                self.assertEqual(order, _per_signal_order(self.manager, signal, '2025-01-01T00:00:00+00:00'))
+
+    def test_explicit_allocation_overrides_confidence(self):
+        order = self.manager.create_order_from_signal(
+            {"symbol": "BTC", "action": "SELL", "confidence": "HIGH"}, allocation=0.05
+        )
+        self.assertEqual(order['side'], 'sell')
+        self.assertAlmostEqual(order['amount'], 50.0)
+
+class ConfigLoadingTest(OrderManagerTestCase):
+    """Config loading through the shared YAML cache."""
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(config_utility._YAML_CACHE.clear)
+
+    def test_secrets_merge_leaves_cached_config_untouched(self):
+        config_path = os.path.join(self.base_path, 'settings.yaml')
+        with open(os.path.join(self.base_path, 'secrets.yaml'), 'w') as file:
+            file.write("system:\n  trade_confirmation: true\napi_keys:\n  kucoin:\n    api_key: test-key\n")
+
+        manager = OrderManager(config_path, os.path.join(self.base_path, 'assets.yaml'), test_mode=True)
+        self.assertTrue(manager.config['system']['trade_confirmation'])
+        self.assertEqual(manager.config['api_keys']['kucoin']['api_key'], 'test-key')
+
+        cached = load_yaml(config_path)
+        self.assertEqual(cached, {'system': {'trade_confirmation': False, 'max_allocation_per_asset': 0.2}})
+        self.assertIsNot(manager.config, cached)
+
+class OrderHistoryTest(OrderManagerTestCase):
+    """get_order_history ordering and filtering."""
+
+    def _write_order(self, order_id, timestamp):
+        with open(os.path.join(self.orders_path, f"order_{order_id}_2025-01-01.json"), 'w') as file:
+            json.dump({"order_id": order_id, "timestamp": timestamp}, file)
+
+    def test_orders_sorted_by_instant_across_utc_and_local_timestamps(self):
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        # Older records carry naive local times
+        self._write_order('local_newest', (now - timedelta(minutes=1)).astimezone().replace(tzinfo=None).isoformat())
+        self._write_order('utc_middle', (now - timedelta(hours=2)).isoformat(timespec='seconds'))
+        self._write_order('local_oldest', (now - timedelta(hours=3)).astimezone().replace(tzinfo=None).isoformat())
+        self._write_order('zulu_newest', (now - timedelta(seconds=10)).strftime('%Y-%m-%dT%H:%M:%SZ'))
+        self._write_order('unparsable', 'yesterday')
+
+        ids = [order['order_id'] for order in self.manager.get_order_history(days_back=1)]
+        self.assertEqual(ids, ['zulu_newest', 'local_newest', 'utc_middle', 'local_oldest', 'unparsable'])
+
+    def test_old_orders_filtered_out(self):
+        now = datetime.now(timezone.utc)
+        self._write_order('recent', (now - timedelta(days=1)).isoformat(timespec='seconds'))
+        self._write_order('old', (now - timedelta(days=10)).isoformat(timespec='seconds'))
+
+        ids = [order['order_id'] for order in self.manager.get_order_history(days_back=7)]
+        self.assertEqual(ids, ['recent'])
+
+    def test_new_order_timestamps_are_utc(self):
+        orders = self.manager.create_orders_from_signals([{"symbol": "BTC", "action": "BUY", "confidence": "HIGH"}])
+        self.assertEqual(datetime.fromisoformat(orders[0]['timestamp']).utcoffset(), timedelta(0))
+
+        result = self.manager.submit_order(orders[0], confirm=False)
+        self.assertEqual(datetime.fromisoformat(result['timestamp']).utcoffset(), timedelta(0))
+
+if __name__ == '__main__':
+    unittest.main()